@@ -1,47 +1,104 @@
 #!/usr/bin/env python3
 """
-Export rhea-labs-2025.html to PDF using Playwright (headless Chrome).
-Renders exactly like the browser.
+Export rhea-labs-2025.html (or any HTML decks) to PDF using Playwright
+(headless Chrome). Renders exactly like the browser.
+
+All decks share one warm browser (lib.html_pdf.PdfRenderService) and
+render concurrently; each waits for fonts, images and animations to
+settle rather than a fixed delay.
 
 Usage:
     python export_pdf.py
+    python export_pdf.py deck1.html deck2.html -o exports/
+    python export_pdf.py *.html --pages 8
 """
 
+import argparse
+import sys
+import time
 from pathlib import Path
-from playwright.sync_api import sync_playwright
-
-
-def export_to_pdf():
-    html_path = Path(__file__).parent / "rhea-labs-2025.html"
-    pdf_path = Path(__file__).parent / "rhea-labs-2025.pdf"
-
-    print(f"📄 Converting: {html_path.name}")
-    print(f"   Using: Playwright (headless Chromium)")
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-        
-        # Load the HTML file
-        page.goto(f"file://{html_path.absolute()}")
-        
-        # Wait for fonts and animations to settle
-        page.wait_for_timeout(1000)
-        
-        # Export to PDF - landscape US Letter with margins
-        page.pdf(
-            path=str(pdf_path),
-            format="Letter",
-            landscape=True,
-            print_background=True,
-            margin={"top": "0.5in", "right": "0.5in", "bottom": "0.5in", "left": "0.5in"},
-        )
-        
-        browser.close()
-
-    print(f"✅ PDF saved: {pdf_path}")
-    print(f"   Size: {pdf_path.stat().st_size / 1024:.1f} KB")
+from typing import Optional
+
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+
+from lib.html_pdf import PdfRenderService
+
+# Landscape US Letter with margins
+PDF_OPTIONS = dict(
+    format="Letter",
+    landscape=True,
+    print_background=True,
+    margin={"top": "0.5in", "right": "0.5in", "bottom": "0.5in", "left": "0.5in"},
+)
+
+
+def export_to_pdf(html_paths: list[Path], output_dir: Optional[Path] = None, pages: int = 4) -> list[Path]:
+    """
+    Convert HTML files to PDFs next to them (or in output_dir).
+
+    Args:
+        html_paths: HTML files to export.
+        output_dir: Directory for the PDFs. Defaults to each HTML file's directory.
+        pages: Browser pages rendering at once.
+
+    Returns:
+        The PDFs written.
+    """
+    jobs = []
+    taken = set()
+    for html_path in html_paths:
+        if not html_path.exists():
+            print(f"❌ Not found: {html_path}")
+            continue
+        pdf_path = (output_dir or html_path.parent) / f"{html_path.stem}.pdf"
+        # Decks with the same name from different folders (-o): deck.pdf, deck-2.pdf, ...
+        n = 1
+        while pdf_path.resolve() in taken:
+            n += 1
+            pdf_path = pdf_path.with_name(f"{html_path.stem}-{n}.pdf")
+        if n > 1:
+            print(f"⚠️  {html_path} → {pdf_path.name} ({html_path.stem}.pdf is already taken)")
+        taken.add(pdf_path.resolve())
+        jobs.append((html_path, pdf_path))
+
+    if not jobs:
+        print("❌ No HTML files to convert")
+        return []
+
+    print(f"📄 Converting {len(jobs)} file(s)")
+    print("   Using: Playwright (headless Chromium)")
+
+    start = time.time()
+    written = []
+    with PdfRenderService(pages=min(pages, len(jobs))) as service:
+        results = service.render_many(jobs, **PDF_OPTIONS)
+
+    for html_path, pdf_path in jobs:
+        result = results[pdf_path]
+        if isinstance(result, Exception):
+            print(f"⚠️  Failed {html_path.name}: {result}")
+            continue
+        written.append(pdf_path)
+        print(f"✅ PDF saved: {pdf_path} ({result:.2f}s, {pdf_path.stat().st_size / 1024:.1f} KB)")
+
+    print(f"\n✅ Done! {len(written)}/{len(jobs)} PDFs in {time.time() - start:.1f}s")
+    return written
+
+
+def main():
+    """CLI entry point."""
+    default_html = Path(__file__).parent / "rhea-labs-2025.html"
+
+    parser = argparse.ArgumentParser(description="Export HTML decks to PDF with headless Chromium")
+    parser.add_argument("html", nargs="*", type=Path, help=f"HTML files (default: {default_html.name})")
+    parser.add_argument("-o", "--output-dir", type=Path, help="Output directory (default: next to each HTML file)")
+    parser.add_argument("--pages", type=int, default=4, help="Concurrent browser pages (default: 4)")
+
+    args = parser.parse_args()
+
+    export_to_pdf(args.html or [default_html], args.output_dir, args.pages)
 
 
 if __name__ == "__main__":
-    export_to_pdf()
+    main()
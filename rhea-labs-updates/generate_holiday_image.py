@@ -17,25 +17,22 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+
+from lib.gemini_backend import GeminiBackend
+
 
 def generate_holiday_image():
     """Generate a holiday-themed image with Rhea brand colors."""
     
-    try:
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        print("❌ google-genai package not installed.")
-        print("Install with: pip install google-genai")
-        sys.exit(1)
-    
     api_key = os.getenv('GOOGLE_API_KEY')
     if not api_key:
         print("❌ GOOGLE_API_KEY not found in environment.")
         print("Set it with: export GOOGLE_API_KEY=your_key")
         sys.exit(1)
     
-    client = genai.Client(api_key=api_key)
+    backend = GeminiBackend(api_key=api_key)
     
     # Rhea brand colors:
     # --rhea-amber: #F5AF50 (warm amber/orange)
@@ -82,33 +79,13 @@ def generate_holiday_image():
     output_path = Path(__file__).parent / "holiday_bg.png"
     
     print("🎨 Generating Rhea Labs holiday image...")
-    print(f"   Model: gemini-3-pro-image-preview")
+    print(f"   Model: {backend.model}")
     print(f"   Output: {output_path}")
     
     try:
-        response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
-            contents=[prompt],
-            config=types.GenerateContentConfig(
-                response_modalities=['TEXT', 'IMAGE'],
-                image_config=types.ImageConfig(
-                    aspect_ratio="16:9",
-                    image_size="2K"
-                ),
-            )
-        )
-        
-        image_saved = False
-        for part in response.parts:
-            if part.text is not None:
-                print(f"   Model note: {part.text[:150]}...")
-            elif image := part.as_image():
-                image.save(str(output_path))
-                image_saved = True
-                print(f"✅ Saved: {output_path}")
-        
-        if not image_saved:
-            raise RuntimeError("No image was generated in the response")
+        image_data = backend.generate(prompt, aspect_ratio="16:9", size="2K")
+        backend.save(image_data, output_path)
+        print(f"✅ Saved: {output_path}")
         
         return output_path
         
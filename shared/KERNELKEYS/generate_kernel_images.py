@@ -11,7 +11,6 @@ Usage:
     python /Users/davidsilver/dev/websites/shared/KERNELKEYS/generate_kernel_images.py
 """
 
-import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
@@ -20,6 +19,11 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent / "SBIR" / "code" / ".env"
 load_dotenv(env_path)
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.gemini_backend import GeminiBackend
+
 
 class KernelKeysImageGenerator:
     """
@@ -153,9 +157,7 @@ class KernelKeysImageGenerator:
     }
     
     def __init__(self, output_dir: str = None):
-        self._client = None
-        self._genai = None
-        self._types = None
+        self._backend = None
         
         if output_dir:
             self.output_dir = Path(output_dir)
@@ -165,28 +167,14 @@ class KernelKeysImageGenerator:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         print(f"📁 Output directory: {self.output_dir}")
     
-    def _get_client(self):
-        if self._client is None:
-            try:
-                from google import genai
-                from google.genai import types
-                self._genai = genai
-                self._types = types
-            except ImportError:
-                print("❌ google-genai package not installed.")
-                sys.exit(1)
-            
-            api_key = os.getenv('GOOGLE_API_KEY')
-            if not api_key:
-                raise ValueError("GOOGLE_API_KEY not found in environment")
-            
-            self._client = genai.Client(api_key=api_key)
+    def _get_backend(self) -> GeminiBackend:
+        if self._backend is None:
+            self._backend = GeminiBackend(model=self.MODEL)
         
-        return self._client
+        return self._backend
     
     def generate_image(self, name: str, prompt_data: dict) -> Path:
-        client = self._get_client()
-        types = self._types
+        backend = self._get_backend()
         
         prompt = prompt_data["prompt"]
         aspect = self.ASPECT_RATIOS[prompt_data["aspect"]]
@@ -201,30 +189,9 @@ class KernelKeysImageGenerator:
         print(f"   Prompt preview: {prompt[:80]}...")
         
         try:
-            response = client.models.generate_content(
-                model=self.MODEL,
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect,
-                        image_size="2K"
-                    ),
-                )
-            )
-            
-            image_saved = False
-            for part in response.parts:
-                if part.text is not None:
-                    print(f"   Model note: {part.text[:100]}...")
-                elif image := part.as_image():
-                    save_path.parent.mkdir(parents=True, exist_ok=True)
-                    image.save(str(save_path))
-                    image_saved = True
-                    print(f"✅ Saved: {save_path}")
-            
-            if not image_saved:
-                raise RuntimeError("No image was generated in the response")
+            image_data = backend.generate(prompt, aspect_ratio=aspect, size="2K")
+            backend.save(image_data, save_path)
+            print(f"✅ Saved: {save_path}")
             
             return save_path
             
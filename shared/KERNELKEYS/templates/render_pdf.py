@@ -4,31 +4,57 @@ Render HTML Templates to PDF
 ============================
 Converts letter.html and quotation.html to PDF using weasyprint.
 
+The templates are Jinja2: rendered without --data they keep their
+placeholders ("[Client Name]", "[Date]", ...) and come out as blank
+forms; with --data every record fills one copy.
+
+Batch mode renders any number of files (or glob patterns) in a single
+process with one lib.weasy_render.WeasyRenderer, so fonts, stylesheets
+and the logo are loaded once instead of once per document.
+
 Usage:
     cd /Users/davidsilver/dev/websites/shared/KERNELKEYS/templates
     source ../../venv/bin/activate
     python render_pdf.py letter.html output.pdf
     python render_pdf.py quotation.html output.pdf
+
+    # Batch: every match goes to <output-dir>/<name>.pdf
+    python render_pdf.py letter.html quotation.html -o out/
+    python render_pdf.py "quotes/*.html" -o out/ --css print_overrides.css
+
+    # Mail merge: one filled-in copy per CSV/JSON record (see lib.mail_merge)
+    python render_pdf.py quotation.html --data quotes.csv -o quotes_q1/ \
+        --name "{{ quote_number }}" --merge quotes_q1/all_quotes.pdf
 """
 
+import argparse
+import glob
+import os
 import sys
+import time
+from collections import Counter
 from pathlib import Path
+from typing import Optional
 
-try:
-    from weasyprint import HTML
-except ImportError:
-    print("❌ weasyprint not installed.")
-    print("   Install with: pip install weasyprint")
-    sys.exit(1)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from lib.mail_merge import DEFAULT_NAME_PATTERN, load_records, mail_merge, render_template
+from lib.weasy_render import WeasyRenderer
 
 
-def render_pdf(html_path: str, output_path: str):
+def render_pdf(
+    html_path: str,
+    output_path: str,
+    renderer: Optional[WeasyRenderer] = None,
+    stylesheets: Optional[list] = None,
+):
     """
     Render an HTML file to PDF.
     
     Args:
         html_path: Path to HTML template file
         output_path: Path for output PDF file
+        renderer: Shared renderer to reuse (a new one is created if None)
+        stylesheets: Extra CSS objects from renderer.stylesheet()
     """
     html_path = Path(html_path)
     output_path = Path(output_path)
@@ -37,16 +63,12 @@ def render_pdf(html_path: str, output_path: str):
         print(f"❌ HTML file not found: {html_path}")
         sys.exit(1)
     
-    # Resolve relative paths in HTML (for images, etc.)
-    base_url = html_path.parent.absolute().as_uri()
-    
+    # Relative paths in the HTML (images, etc.) resolve against its directory
     print(f"📄 Rendering: {html_path}")
-    print(f"   Base URL: {base_url}")
     print(f"   Output: {output_path}")
     
     try:
-        html_doc = HTML(filename=str(html_path), base_url=base_url)
-        html_doc.write_pdf(output_path)
+        render_template(html_path, output_path, renderer=renderer or WeasyRenderer(), stylesheets=stylesheets)
         print(f"✅ PDF created: {output_path}")
         print(f"   Size: {output_path.stat().st_size:,} bytes")
     except Exception as e:
@@ -56,12 +78,126 @@ def render_pdf(html_path: str, output_path: str):
         sys.exit(1)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python render_pdf.py <input.html> <output.pdf>")
-        print("\nExample:")
-        print("  python render_pdf.py letter.html letter_output.pdf")
-        print("  python render_pdf.py quotation.html quote_output.pdf")
-        sys.exit(1)
+def expand_inputs(patterns: list[str]) -> list[Path]:
+    """Files named directly plus every match of glob patterns, without duplicates."""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                print(f"⚠️  No files match: {pattern}")
+            paths.extend(Path(m) for m in matches)
+        else:
+            paths.append(Path(pattern))
+    unique = {}
+    for path in paths:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def batch_output_paths(html_paths: list[Path], output_dir: Path) -> dict[Path, Path]:
+    """
+    PDF path for each HTML file: <output_dir>/<stem>.pdf.
+
+    Files that share a stem (a/quote.html, b/quote.html) keep their
+    directory relative to the inputs' common parent instead
+    (<output_dir>/a/quote.pdf, <output_dir>/b/quote.pdf), so none
+    overwrites another.
+    """
+    stems = Counter(path.stem for path in html_paths)
+    duplicates = [path.resolve() for path in html_paths if stems[path.stem] > 1]
+    common = Path(os.path.commonpath([path.parent for path in duplicates])) if duplicates else None
+    
+    outputs = {}
+    for html_path in html_paths:
+        if stems[html_path.stem] > 1:
+            relative = html_path.resolve().parent.relative_to(common)
+            outputs[html_path] = output_dir / relative / f"{html_path.stem}.pdf"
+        else:
+            outputs[html_path] = output_dir / f"{html_path.stem}.pdf"
+    return outputs
+
+
+def render_batch(html_paths: list[Path], output_dir: Path, css_paths: Optional[list[Path]] = None) -> list[Path]:
+    """
+    Render many HTML files with one shared renderer.
     
-    render_pdf(sys.argv[1], sys.argv[2])
+    Args:
+        html_paths: HTML files to render
+        output_dir: Directory for <stem>.pdf outputs (see batch_output_paths)
+        css_paths: Extra stylesheets applied to every document
+    
+    Returns:
+        The PDFs written
+    """
+    renderer = WeasyRenderer()
+    stylesheets = [renderer.stylesheet(path) for path in css_paths or []]
+    
+    print(f"📄 Rendering {len(html_paths)} documents → {output_dir}")
+    
+    output_paths = batch_output_paths(html_paths, output_dir)
+    written = []
+    start = time.time()
+    for html_path in html_paths:
+        output_path = output_paths[html_path]
+        if not html_path.exists():
+            print(f"❌ HTML file not found: {html_path}")
+            continue
+        try:
+            elapsed = render_template(html_path, output_path, renderer=renderer, stylesheets=stylesheets)
+        except Exception as e:
+            print(f"⚠️  Failed {html_path.name}: {e}")
+            continue
+        written.append(output_path)
+        print(f"✅ {output_path.relative_to(output_dir)} ({elapsed:.2f}s)")
+    
+    total = time.time() - start
+    rate = len(written) / total * 60 if total > 0 else 0
+    print(f"\n✅ Done! {len(written)}/{len(html_paths)} PDFs in {total:.1f}s ({rate:.0f}/min)")
+    return written
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Render HTML templates to PDF with weasyprint")
+    parser.add_argument("inputs", nargs="+", help="HTML files or glob patterns (or: <input.html> <output.pdf>)")
+    parser.add_argument("-o", "--output-dir", type=Path, help="Batch mode: directory for the PDFs")
+    parser.add_argument("--css", type=Path, action="append", help="Extra stylesheet (repeatable)")
+    parser.add_argument("--data", type=Path, help="Mail merge: CSV/JSON/JSONL of records to fill the template with")
+    parser.add_argument("--name", default=DEFAULT_NAME_PATTERN,
+                        help='Mail merge: Jinja file name pattern (e.g. "{{ quote_number }}")')
+    parser.add_argument("--merge", type=Path, help="Mail merge: also write every PDF into this one file")
+    parser.add_argument("--workers", type=int, help="Mail merge: worker processes (default: CPU count)")
+    
+    args = parser.parse_args()
+    
+    if args.data:
+        if len(args.inputs) != 1:
+            parser.error("--data takes exactly one template")
+        results = mail_merge(
+            args.inputs[0],
+            load_records(args.data),
+            output_dir=args.output_dir or Path("."),
+            name_pattern=args.name,
+            merged_path=args.merge,
+            workers=args.workers,
+        )
+        if any(isinstance(r, Exception) for r in results.values()):
+            sys.exit(1)
+        return
+    
+    # Original single-document form: render_pdf.py input.html output.pdf
+    if args.output_dir is None and len(args.inputs) == 2 and args.inputs[1].lower().endswith(".pdf"):
+        renderer = WeasyRenderer()
+        stylesheets = [renderer.stylesheet(path) for path in args.css or []]
+        render_pdf(args.inputs[0], args.inputs[1], renderer, stylesheets)
+        return
+    
+    html_paths = expand_inputs(args.inputs)
+    written = render_batch(html_paths, args.output_dir or Path("."), args.css)
+    if len(written) < len(html_paths):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,128 +1,26 @@
 #!/usr/bin/env python3
 """
 Convert Markdown files to PDF for USPTO filing.
-"""
 
-import markdown
-from weasyprint import HTML, CSS
-from pathlib import Path
+Usage:
+    python md_to_pdf.py
+    python md_to_pdf.py --workers 1   # one document at a time
+    python md_to_pdf.py --force       # rebuild up-to-date documents too
+
+The documents are listed in patent_build.json and built by
+lib.patent_docs. Only documents whose markdown, referenced images or CSS
+changed since the last build are regenerated (hashes kept in
+.build_stamp.json).
 
-CSS_STYLE = """
-@page {
-    size: letter;
-    margin: 1in;
-}
-body {
-    font-family: "Times New Roman", Times, serif;
-    font-size: 12pt;
-    line-height: 1.5;
-}
-h1 {
-    font-size: 16pt;
-    font-weight: bold;
-    margin-top: 24pt;
-    margin-bottom: 12pt;
-}
-h2 {
-    font-size: 14pt;
-    font-weight: bold;
-    margin-top: 18pt;
-    margin-bottom: 10pt;
-}
-h3 {
-    font-size: 12pt;
-    font-weight: bold;
-    margin-top: 14pt;
-    margin-bottom: 8pt;
-}
-table {
-    border-collapse: collapse;
-    margin: 10pt 0;
-    width: 100%;
-}
-th, td {
-    border: 1px solid black;
-    padding: 6pt 8pt;
-    text-align: left;
-}
-th {
-    background-color: #f0f0f0;
-}
-code {
-    font-family: "Courier New", Courier, monospace;
-    font-size: 10pt;
-    background-color: #f5f5f5;
-    padding: 2pt 4pt;
-}
-pre {
-    font-family: "Courier New", Courier, monospace;
-    font-size: 10pt;
-    background-color: #f5f5f5;
-    padding: 10pt;
-    margin: 10pt 0;
-    white-space: pre-wrap;
-    word-wrap: break-word;
-}
-blockquote {
-    border-left: 3pt solid #ccc;
-    margin-left: 0;
-    padding-left: 12pt;
-    font-style: italic;
-}
-hr {
-    border: none;
-    border-top: 1pt solid #ccc;
-    margin: 20pt 0;
-}
-ul, ol {
-    margin: 10pt 0;
-    padding-left: 20pt;
-}
+Build every patent filing at once from shared/:
+    python -m lib.patent_docs
 """
 
-def md_to_pdf(input_file: str, output_file: str):
-    """Convert a markdown file to PDF."""
-    md_content = Path(input_file).read_text()
-    
-    # Convert markdown to HTML
-    html_content = markdown.markdown(
-        md_content,
-        extensions=['tables', 'fenced_code', 'toc']
-    )
-    
-    # Wrap in HTML document
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-    </head>
-    <body>
-    {html_content}
-    </body>
-    </html>
-    """
-    
-    # Convert to PDF
-    HTML(string=full_html).write_pdf(
-        output_file,
-        stylesheets=[CSS(string=CSS_STYLE)]
-    )
-    print(f"Created: {output_file}")
+import sys
+from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from lib.patent_docs import main
 
 if __name__ == '__main__':
-    # Convert all patent documents
-    md_to_pdf('draft.md', 'SPECIFICATION.pdf')
-    md_to_pdf('CLAIMS.md', 'CLAIMS.pdf')
-    md_to_pdf('COVER_SHEET.md', 'COVER_SHEET.pdf')
-    
-    print("\n" + "="*50)
-    print("USPTO Filing Documents Ready:")
-    print("="*50)
-    print("  1. SPECIFICATION.pdf  - Main specification (required)")
-    print("  2. COVER_SHEET.pdf    - Cover sheet (required)")
-    print("  3. CLAIMS.pdf         - Claim language (recommended)")
-    print("  4. DRAWINGS.pdf       - 5 figures (recommended)")
-    print("\nUpload all to USPTO Patent Center.")
-
+    main([str(Path(__file__).parent), *sys.argv[1:]])
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Alpha keying for flat-background logos and icons.
+
+Generalizes fix_logo_backgrounds.make_black_transparent: any key color
+(or one estimated from the image border), distance in RGB or CIE Lab,
+a feathered alpha ramp instead of a hard cut, and optional despill so
+anti-aliased edges lose the background tint instead of leaving a halo.
+
+Everything is whole-array NumPy math, so a 2K image keys in a fraction
+of a second with no neural model involved. For photos or busy
+backgrounds use rembg (lib.background) instead.
+
+Usage:
+    # Icons from generate_embino_icons.py (black background, auto-detected)
+    python alpha_key.py ../images/icons -o ../images/icons_keyed
+
+    # Explicit key color, perceptual distance, wider feather
+    python alpha_key.py ../images/team --key "#0C0C0C" --metric lab --softness 20 --in-place
+
+    # Python
+    from alpha_key import alpha_key
+    keyed = alpha_key(Image.open("logo.png"), key_color="#0C0C0C")
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from PIL import Image
+
+from fix_logo_backgrounds import collect_files, run_pool
+
+# (tolerance, softness) per metric. RGB distances run 0-441, Lab ΔE 0-~100.
+DEFAULT_THRESHOLDS = {
+    "rgb": (30.0, 40.0),
+    "lab": (8.0, 12.0),
+}
+
+Color = Union[str, Sequence[int], None]
+
+
+def parse_color(value: Color) -> Optional[np.ndarray]:
+    """
+    Turn "#RRGGBB", "#RGB", "r,g,b", a 3-sequence or None/"auto" into an RGB array.
+
+    Returns:
+        float32 array of shape (3,), or None to request auto-detection.
+    """
+    if value is None or (isinstance(value, str) and value.lower() == "auto"):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("#"):
+            if len(value) == 4:  # "#fff" → "#ffffff"
+                value = "#" + "".join(c * 2 for c in value[1:])
+            if len(value) != 7:
+                raise ValueError(f"Hex key color must be #RGB or #RRGGBB: {value!r}")
+            return np.array([int(value[i:i + 2], 16) for i in (1, 3, 5)], dtype=np.float32)
+        value = [int(v) for v in value.split(",")]
+    if len(value) != 3:
+        raise ValueError(f"Key color must have 3 components: {value!r}")
+    return np.asarray(value, dtype=np.float32)
+
+
+def estimate_key_color(rgb: np.ndarray, border: int = 4) -> np.ndarray:
+    """
+    Background color estimate: per-channel median of the outer border.
+
+    Args:
+        rgb: (H, W, 3) array.
+        border: Width in pixels of the frame that is sampled.
+    """
+    border = max(1, min(border, rgb.shape[0] // 2, rgb.shape[1] // 2))
+    frame = np.concatenate([
+        rgb[:border].reshape(-1, 3),
+        rgb[-border:].reshape(-1, 3),
+        rgb[:, :border].reshape(-1, 3),
+        rgb[:, -border:].reshape(-1, 3),
+    ])
+    return np.median(frame, axis=0).astype(np.float32)
+
+
+def srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert sRGB values in 0-255 (any shape ending in 3) to CIE Lab (D65)."""
+    c = rgb.astype(np.float32) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ], dtype=np.float32)
+    xyz /= np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+    delta = 6 / 29
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def color_distance(rgb: np.ndarray, key: np.ndarray, metric: str = "rgb") -> np.ndarray:
+    """
+    Per-pixel distance from the key color.
+
+    Args:
+        rgb: (H, W, 3) float array in 0-255.
+        key: (3,) key color in 0-255.
+        metric: "rgb" (Euclidean) or "lab" (CIE76 ΔE).
+
+    Returns:
+        (H, W) float32 distances.
+    """
+    if metric == "lab":
+        diff = srgb_to_lab(rgb) - srgb_to_lab(key)
+    elif metric == "rgb":
+        diff = rgb - key
+    else:
+        raise ValueError(f"Unknown metric {metric!r} (expected 'rgb' or 'lab')")
+    return np.sqrt(np.einsum("...c,...c->...", diff, diff, dtype=np.float32))
+
+
+def alpha_key(
+    img: Image.Image,
+    key_color: Color = None,
+    metric: str = "rgb",
+    tolerance: Optional[float] = None,
+    softness: Optional[float] = None,
+    despill: bool = True,
+) -> Image.Image:
+    """
+    Key out a flat background color.
+
+    Pixels closer than ``tolerance`` to the key become fully transparent,
+    pixels farther than ``tolerance + softness`` keep their alpha, and the
+    band in between gets a linear alpha ramp. Existing transparency is
+    never reduced.
+
+    Args:
+        img: Source image (any mode).
+        key_color: "#RRGGBB", "r,g,b", an RGB tuple, or None/"auto" to use
+                   the median border color.
+        metric: "rgb" or "lab".
+        tolerance: Distance treated as pure background. Defaults per metric.
+        softness: Width of the feather ramp. Defaults per metric; 0 gives
+                  a hard key like make_black_transparent.
+        despill: Un-mix the key color from semi-transparent pixels so
+                 edges do not keep a background-colored fringe.
+
+    Returns:
+        RGBA image.
+    """
+    default_tolerance, default_softness = DEFAULT_THRESHOLDS[metric]
+    tolerance = default_tolerance if tolerance is None else tolerance
+    softness = default_softness if softness is None else softness
+
+    rgba = np.asarray(img.convert("RGBA"), dtype=np.float32)
+    rgb = rgba[..., :3]
+
+    key = parse_color(key_color)
+    if key is None:
+        key = estimate_key_color(rgb)
+
+    distance = color_distance(rgb, key, metric)
+    if softness > 0:
+        alpha = np.clip((distance - tolerance) / softness, 0.0, 1.0)
+    else:
+        alpha = (distance >= tolerance).astype(np.float32)
+
+    if despill:
+        # Observed = a * C + (1 - a) * K  =>  C = (observed - (1 - a) * K) / a
+        partial = (alpha > 0) & (alpha < 1)
+        a = alpha[partial][:, None]
+        rgb[partial] = np.clip((rgb[partial] - (1 - a) * key) / a, 0, 255)
+
+    rgba[..., 3] = np.minimum(rgba[..., 3], alpha * 255)
+    return Image.fromarray(np.rint(rgba).astype(np.uint8), "RGBA")
+
+
+def key_file(src: Path, dst: Optional[Path] = None, **options) -> Path:
+    """Key one file (in place when dst is None) and return the output path."""
+    dst = dst or src
+    with Image.open(src) as img:
+        keyed = alpha_key(img, **options)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    keyed.save(dst)
+    return dst
+
+
+def _key_one(src: Path, dst: Path, options: dict) -> float:
+    """Worker task: key one file and return the time it took."""
+    start = time.time()
+    key_file(src, dst, **options)
+    return time.time() - start
+
+
+def key_paths(
+    paths: list[Path],
+    output_dir: Optional[Path] = None,
+    pattern: str = "*.png",
+    recursive: bool = False,
+    workers: Optional[int] = None,
+    **options,
+) -> list[Path]:
+    """
+    Key many files in a process pool.
+
+    Args:
+        paths: Image files and/or directories to scan.
+        output_dir: Where results go (PNG), mirroring each file's path below
+                    the directory it was found in. None overwrites the inputs.
+        pattern: Glob pattern used inside directories.
+        recursive: Whether to descend into subdirectories.
+        workers: Worker processes (default: CPU count).
+        options: Keyword arguments for alpha_key().
+
+    Returns:
+        The output paths written.
+    """
+    jobs = []
+    claimed = {}
+    for root, src in collect_files(paths, pattern, recursive):
+        dst = output_dir / src.relative_to(root).with_suffix(".png") if output_dir else src
+        if dst in claimed:
+            print(f"⚠️  Skipping {src}: {dst} is already written from {claimed[dst]}")
+            continue
+        claimed[dst] = src
+        jobs.append((str(src.relative_to(root)), dst, (src, dst, options)))
+    return run_pool(_key_one, jobs, workers, "Keying", "Keyed")
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Key out flat logo/icon backgrounds without rembg")
+    parser.add_argument("paths", nargs="+", type=Path, help="Image files or directories")
+    parser.add_argument("-o", "--output-dir", type=Path, help="Output directory (default: overwrite inputs)")
+    parser.add_argument("--key", default="auto", help='Key color: "#RRGGBB", "r,g,b" or "auto" (default: auto)')
+    parser.add_argument("--metric", choices=sorted(DEFAULT_THRESHOLDS), default="rgb",
+                        help="Color distance metric (default: rgb)")
+    parser.add_argument("--tolerance", type=float, help="Distance keyed fully transparent")
+    parser.add_argument("--softness", type=float, help="Width of the feathered edge (0 = hard key)")
+    parser.add_argument("--no-despill", action="store_true", help="Keep the key color in edge pixels")
+    parser.add_argument("--pattern", default="*.png", help="Glob pattern inside directories (default: *.png)")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args()
+
+    key_paths(
+        args.paths,
+        output_dir=args.output_dir,
+        pattern=args.pattern,
+        recursive=args.recursive,
+        workers=args.workers,
+        key_color=args.key,
+        metric=args.metric,
+        tolerance=args.tolerance,
+        softness=args.softness,
+        despill=not args.no_despill,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,177 @@
 #!/usr/bin/env python3
 """
 Fix logo backgrounds - replace pure black with transparency.
+
+Usage:
+    # The team logos (default)
+    python fix_logo_backgrounds.py
+
+    # Whole directories, one process per core
+    python fix_logo_backgrounds.py ../images/icons ../images/team --threshold 40
+    python fix_logo_backgrounds.py ../images --recursive --workers 4
 """
 
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from PIL import Image
+from typing import Callable, Optional
+
+from PIL import Image, ImageChops
+
+
+def _below(channel: Image.Image, threshold: int) -> Image.Image:
+    """8-bit mask: 255 where the channel value is below threshold, else 0."""
+    return channel.point(lambda v: 255 if v < threshold else 0)
 
-def make_black_transparent(image_path: Path, threshold: int = 30):
-    """Replace near-black pixels with transparency."""
+
+def make_black_transparent(image_path: Path, threshold: int = 30, verbose: bool = True):
+    """
+    Replace near-black pixels with transparency.
+
+    A pixel is near-black when r, g and b are all below threshold; its
+    alpha becomes 0 and its color is kept. Works on whole channels
+    (Image.point / ImageChops) instead of visiting pixels in Python.
+    """
     img = Image.open(image_path).convert('RGBA')
-    pixels = img.load()
-    width, height = img.size
-    
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            # If pixel is near-black, make it transparent
-            if r < threshold and g < threshold and b < threshold:
-                pixels[x, y] = (r, g, b, 0)
-    
+    r, g, b, a = img.split()
+
+    # AND of the three per-channel masks (255 * 255 saturates, anything * 0 is 0)
+    mask = ImageChops.multiply(
+        ImageChops.multiply(_below(r, threshold), _below(g, threshold)),
+        _below(b, threshold),
+    )
+    img.putalpha(ImageChops.subtract(a, mask))
+
     img.save(image_path)
-    print(f"✅ Fixed: {image_path.name}")
+    if verbose:
+        print(f"✅ Fixed: {image_path.name}")
 
-if __name__ == "__main__":
+
+def _fix_one(image_path: Path, threshold: int) -> float:
+    """Worker task: fix one file and return the time it took."""
+    start = time.time()
+    make_black_transparent(image_path, threshold, verbose=False)
+    return time.time() - start
+
+
+def collect_files(
+    paths: list[Path],
+    pattern: str = "*.png",
+    recursive: bool = False,
+) -> list[tuple[Path, Path]]:
+    """
+    Expand files and directories into (root, file) pairs.
+
+    root is the directory argument a file was found under, or the file's
+    own parent when it was given directly, so callers can mirror
+    ``file.relative_to(root)`` into an output directory.
+    """
+    files = []
+    for path in paths:
+        if path.is_dir():
+            found = path.rglob(pattern) if recursive else path.glob(pattern)
+            files.extend((path, f) for f in sorted(found) if f.is_file())
+        elif path.exists():
+            files.append((path.parent, path))
+        else:
+            print(f"❌ Not found: {path}")
+    return files
+
+
+def run_pool(
+    task: Callable[..., float],
+    jobs: list[tuple[str, Path, tuple]],
+    workers: Optional[int] = None,
+    action: str = "Processing",
+    done: str = "Processed",
+    detail: str = "",
+) -> list[Path]:
+    """
+    Run task(*args) for every (label, result, args) job in a process pool.
+
+    task must be a module-level function (so it can be pickled) returning
+    the seconds it took. A failed job is reported and does not stop the rest.
+
+    Args:
+        task: Worker function.
+        jobs: (label for messages, path to report on success, task args).
+        workers: Worker processes (default: CPU count).
+        action: Verb for the start message, e.g. "Fixing".
+        done: Verb for each success message, e.g. "Fixed".
+        detail: Extra text appended to the start message.
+
+    Returns:
+        The result paths of the jobs that succeeded.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    print(f"🖼️  {action} {len(jobs)} images with {workers} workers{detail}")
+
+    succeeded = []
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(task, *args): (label, result) for label, result, args in jobs}
+        for future in as_completed(futures):
+            label, result = futures[future]
+            try:
+                elapsed = future.result()
+                succeeded.append(result)
+                print(f"✅ {done}: {label} ({elapsed:.2f}s)")
+            except Exception as e:
+                print(f"⚠️  Failed {label}: {e}")
+
+    print(f"\n✅ Done! {len(succeeded)}/{len(jobs)} images in {time.time() - start:.1f}s")
+    return succeeded
+
+
+def fix_directory(
+    paths: list[Path],
+    threshold: int = 30,
+    pattern: str = "*.png",
+    recursive: bool = False,
+    workers: Optional[int] = None,
+) -> list[Path]:
+    """
+    Make near-black backgrounds transparent for many files in parallel.
+
+    Args:
+        paths: Image files and/or directories to scan.
+        threshold: Same meaning as in make_black_transparent().
+        pattern: Glob pattern used inside directories.
+        recursive: Whether to descend into subdirectories.
+        workers: Worker processes (default: CPU count).
+
+    Returns:
+        The files that were fixed.
+    """
+    jobs = [(f.name, f, (f, threshold)) for _, f in collect_files(paths, pattern, recursive)]
+    return run_pool(_fix_one, jobs, workers, "Fixing", "Fixed", f" (threshold {threshold})")
+
+
+def main():
+    """CLI entry point."""
     team_dir = Path(__file__).parent.parent / "images" / "team"
-    
-    logos = [
-        "logo_apple.png",
-        "logo_intel.png", 
-        "logo_nature.png",
-        "logo_embryonics.png",
+
+    parser = argparse.ArgumentParser(description="Make near-black logo backgrounds transparent")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="Image files or directories (default: the team logos)")
+    parser.add_argument("--threshold", type=int, default=30,
+                        help="Channel value below which a pixel counts as black (default: 30)")
+    parser.add_argument("--pattern", default="*.png", help="Glob pattern inside directories (default: *.png)")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args()
+
+    paths = args.paths or [
+        team_dir / "logo_apple.png",
+        team_dir / "logo_intel.png",
+        team_dir / "logo_nature.png",
+        team_dir / "logo_embryonics.png",
     ]
-    
-    for logo in logos:
-        logo_path = team_dir / logo
-        if logo_path.exists():
-            make_black_transparent(logo_path)
-        else:
-            print(f"❌ Not found: {logo}")
-    
-    print("\n✅ Done! Logos now have transparent backgrounds.")
+    fix_directory(paths, args.threshold, args.pattern, args.recursive, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,17 @@ Generate branding assets for Embino using Gemini.
 Logo variations with terminal aesthetic.
 """
 
-import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lib.gemini_backend import GeminiBackend
+
 LOGOS = {
     "logo-square": {
         "prompt": """Logo for "embino_" tech company.
@@ -66,18 +70,7 @@ LOGOS = {
 
 def generate_logos(output_dir: Path):
     """Generate all logo variations."""
-    try:
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        print("❌ google-genai not installed")
-        sys.exit(1)
-    
-    api_key = os.getenv('GOOGLE_API_KEY')
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY not found")
-    
-    client = genai.Client(api_key=api_key)
+    backend = GeminiBackend(model="gemini-2.0-flash-exp-image-generation")
     output_dir.mkdir(parents=True, exist_ok=True)
     
     for name, data in LOGOS.items():
@@ -95,32 +88,9 @@ CRITICAL REQUIREMENTS:
 - Text must be perfectly legible"""
         
         try:
-            response = client.models.generate_content(
-                model="gemini-2.0-flash-exp-image-generation",
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                ),
-            )
+            backend.save(backend.generate(prompt), save_path)
+            print(f"✅ Saved: {save_path}")
             
-            for part in response.parts:
-                if part.text:
-                    print(f"   Note: {part.text[:80]}...")
-                elif hasattr(part, 'inline_data') and part.inline_data:
-                    # Save image from inline_data
-                    import base64
-                    image_data = part.inline_data.data
-                    if isinstance(image_data, str):
-                        image_data = base64.b64decode(image_data)
-                    with open(save_path, 'wb') as f:
-                        f.write(image_data)
-                    print(f"✅ Saved: {save_path}")
-                    break
-                elif image := getattr(part, 'as_image', lambda: None)():
-                    image.save(str(save_path))
-                    print(f"✅ Saved: {save_path}")
-                    break
-                    
         except Exception as e:
             print(f"❌ Error generating {name}: {e}")
             import traceback
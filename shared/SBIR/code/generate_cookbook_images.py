@@ -27,18 +27,51 @@ Usage:
         ingredients=["semolina pearls", "tomato", "onion", "paprika"],
         output_path="mhamsa_ingredients.png"
     )
+    
+    # Every recipe in a directory, dish + ingredients images in parallel
+    gen.generate_recipes_batch(iter_recipes("data/recipes"), max_workers=4)
+    
+    # Only recipes whose content changed since the last run
+    gen.generate_recipes_batch(iter_recipes("data/recipes"), changed_only=True)
+    
+    # A cookbook-sized JSON Lines file, streamed
+    gen.generate_recipes_batch(iter_recipes("data/cookbook.jsonl"))
 """
 
+import json
 import os
 import re
+import shutil
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import Callable, Iterable, Iterator, Optional, List, Dict, Tuple, Union
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lib.gemini_backend import GeminiBackend
+from lib.image_cache import ImageCache
+
+
+def _keyword_pattern(keywords) -> "re.Pattern":
+    """
+    Compile keywords into one longest-first alternation.
+    
+    Matches whole tokens only, with an optional plural suffix: '2' does not
+    match inside '12', '1/2' or '2.5', 'egg' does not match 'eggplant', and
+    'tablespoons' still matches 'tablespoon'. Group 1 is the keyword.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<![\w/.])({alternation})(?:e?s)?(?!\w|[/.]\d)")
+
 
 class AppearanceAnalyzer:
     """
@@ -142,6 +175,13 @@ class AppearanceAnalyzer:
         'little': 0.4,
     }
     
+    # Matchers built once at class load
+    _COLOR_RE = _keyword_pattern(COLOR_INGREDIENTS)
+    _LIQUID_RE = _keyword_pattern(LIQUID_BASES)
+    _QUANTITY_RE = _keyword_pattern(QUANTITY_PATTERNS)
+    # Later LIQUID_BASES entries win when one line mentions several
+    _LIQUID_ORDER = {key: i for i, key in enumerate(LIQUID_BASES)}
+    
     @classmethod
     def analyze_ingredients(cls, ingredients: List[str]) -> Dict:
         """
@@ -162,34 +202,24 @@ class AppearanceAnalyzer:
             
             # Check for quantity multipliers
             quantity_mult = 1.0
-            for pattern, mult in cls.QUANTITY_PATTERNS.items():
-                if pattern in ing_lower:
-                    quantity_mult = max(quantity_mult, mult)
+            for match in cls._QUANTITY_RE.finditer(ing_lower):
+                quantity_mult = max(quantity_mult, cls.QUANTITY_PATTERNS[match.group(1)])
             
-            # Track which ingredients matched to avoid double-counting
-            # e.g., "sweet paprika" should only match once, not for both "sweet paprika" and "paprika"
-            matched_keys = set()
-            
-            # Check for color-influencing ingredients (longer keys first for specificity)
-            sorted_keys = sorted(cls.COLOR_INGREDIENTS.keys(), key=len, reverse=True)
-            for key in sorted_keys:
-                if key in ing_lower:
-                    # Skip if a more specific key already matched
-                    if any(key in mk or mk in key for mk in matched_keys if mk != key):
-                        continue
-                    
-                    matched_keys.add(key)
-                    color, intensity = cls.COLOR_INGREDIENTS[key]
-                    final_intensity = intensity * quantity_mult
-                    
-                    # Keep the highest intensity for each color
-                    if color not in color_intensities or final_intensity > color_intensities[color]:
-                        color_intensities[color] = final_intensity
+            # Check for color-influencing ingredients. The alternation is
+            # longest-first and matches don't overlap, so "sweet paprika"
+            # counts once rather than also as "paprika".
+            for match in cls._COLOR_RE.finditer(ing_lower):
+                color, intensity = cls.COLOR_INGREDIENTS[match.group(1)]
+                final_intensity = intensity * quantity_mult
+                
+                # Keep the highest intensity for each color
+                if color not in color_intensities or final_intensity > color_intensities[color]:
+                    color_intensities[color] = final_intensity
             
             # Check for liquid bases
-            for key, description in cls.LIQUID_BASES.items():
-                if key in ing_lower:
-                    liquid_base = description
+            liquids = {match.group(1) for match in cls._LIQUID_RE.finditer(ing_lower)}
+            if liquids:
+                liquid_base = cls.LIQUID_BASES[max(liquids, key=cls._LIQUID_ORDER.__getitem__)]
         
         # Convert to sorted list
         colors_found = sorted(
@@ -299,6 +329,96 @@ class AppearanceAnalyzer:
         return ", ".join(textures) if textures else "appetizing home-cooked texture"
 
 
+class RecipeAnalysisIndex:
+    """
+    Persistent per-recipe analysis, keyed by a hash of the recipe content.
+    
+    Each entry stores the detected colors, liquid base, cooking method and
+    the final prompt texts, plus which images were generated from them.
+    Unchanged recipes are never re-analyzed, and --changed-only runs only
+    regenerate images whose recipe changed.
+    
+    Attributes:
+        FILENAME: Index file name used by for_output_dir().
+        path: Location of the index file.
+        entries: Mapping of recipe hash to its analysis entry.
+    """
+    
+    FILENAME = ".recipe_index.json"
+    # Bump when AppearanceAnalyzer or the prompt templates change meaning
+    VERSION = 1
+    
+    def __init__(self, path: Path):
+        """
+        Load an index, or start an empty one if the file does not exist.
+        
+        Args:
+            path: Index file location.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, dict] = {}
+        
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get("version") == self.VERSION:
+                    self.entries = data.get("entries", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️  Ignoring unreadable recipe index {self.path}: {e}")
+    
+    @classmethod
+    def for_output_dir(cls, output_dir: Path) -> "RecipeAnalysisIndex":
+        """Index stored inside the image output directory."""
+        return cls(Path(output_dir) / cls.FILENAME)
+    
+    @classmethod
+    def recipe_hash(cls, recipe_data: dict, **salt) -> str:
+        """Content hash of a recipe (key order independent), plus anything in salt."""
+        return ImageCache.make_key(recipe=recipe_data, version=cls.VERSION, **salt)
+    
+    def get(self, recipe_hash: str) -> Optional[dict]:
+        """Cached entry for a recipe hash, or None."""
+        return self.entries.get(recipe_hash)
+    
+    def put(self, recipe_hash: str, entry: dict):
+        """Store a freshly computed entry."""
+        with self._lock:
+            self.entries[recipe_hash] = entry
+            self._dirty = True
+    
+    def mark_generated(self, recipe_hash: str, kind: str, path: Path):
+        """Record that an image was generated from this entry's prompt."""
+        with self._lock:
+            entry = self.entries.setdefault(recipe_hash, {})
+            entry.setdefault("images", {})[kind] = str(path)
+            self._dirty = True
+    
+    def is_generated(self, recipe_hash: str, kind: str, path: Path) -> bool:
+        """Whether this exact recipe content already produced the image at path."""
+        entry = self.entries.get(recipe_hash) or {}
+        return entry.get("images", {}).get(kind) == str(path) and Path(path).exists()
+    
+    def save(self):
+        """Atomically write the index if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps({"version": self.VERSION, "entries": self.entries}, indent=1, sort_keys=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._dirty = False
+
+
 class CookbookImageGenerator:
     """
     Generates high-quality cookbook images using Gemini 3 Pro Image.
@@ -312,6 +432,9 @@ class CookbookImageGenerator:
     RESOLUTION = "2K"     # High quality for print
     MODEL = "gemini-3-pro-image-preview"
     
+    # Concurrent Gemini requests in generate_recipes_batch (each one is I/O bound)
+    DEFAULT_MAX_WORKERS = 4
+    
     # Style prompts for consistent cookbook aesthetic
     DISH_STYLE = """Professional food photography, top-down or 45-degree angle view, 
     natural soft lighting from window, shallow depth of field, 
@@ -326,17 +449,21 @@ class CookbookImageGenerator:
     cookware and linens as subtle props, cookbook quality,
     vibrant colors, 8K detail, photorealistic"""
     
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(self, output_dir: Optional[str] = None, cache: Union[bool, ImageCache] = True):
         """
         Initialize the image generator.
         
         Args:
             output_dir: Directory to save generated images. 
                        Defaults to data/images/generated
+            cache: True for the default on-disk ImageCache, False to disable
+                   caching, or a custom ImageCache instance.
         """
-        self._client = None
-        self._genai = None
-        self._types = None
+        self._backend = None
+        if cache is True:
+            self.cache: Optional[ImageCache] = ImageCache()
+        else:
+            self.cache = cache or None
         
         # Set output directory
         if output_dir:
@@ -346,19 +473,12 @@ class CookbookImageGenerator:
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-    def _get_client(self):
-        """Lazy load the genai client."""
-        if self._client is None:
-            try:
-                from google import genai
-                from google.genai import types
-                self._genai = genai
-                self._types = types
-            except ImportError:
-                print("❌ google-genai package not installed.")
-                print("Install with: pip install google-genai")
-                sys.exit(1)
-            
+        # Cached analysis/prompts per recipe content hash
+        self.index = RecipeAnalysisIndex.for_output_dir(self.output_dir)
+        
+    def _get_backend(self) -> GeminiBackend:
+        """Lazy load the shared Gemini backend."""
+        if self._backend is None:
             api_key = os.getenv('GOOGLE_API_KEY')
             if not api_key or api_key == 'your_google_api_key_here':
                 raise ValueError(
@@ -366,9 +486,9 @@ class CookbookImageGenerator:
                     "Please set it in your .env file."
                 )
             
-            self._client = genai.Client(api_key=api_key)
+            self._backend = GeminiBackend(api_key=api_key, model=self.MODEL)
         
-        return self._client
+        return self._backend
     
     def generate_dish_image(
         self,
@@ -395,8 +515,31 @@ class CookbookImageGenerator:
         Returns:
             Path to the saved image
         """
-        client = self._get_client()
+        self._get_backend()
+        
+        prompt = self.build_dish_prompt(
+            dish_name, description, ingredients, cultural_context, cooking_method, additional_styling
+        )
         
+        # Determine output path
+        if output_path:
+            save_path = Path(output_path)
+        else:
+            safe_name = dish_name.lower().replace(" ", "_").replace("'", "")
+            save_path = self.output_dir / f"{safe_name}_dish.png"
+        
+        return self._generate_and_save(prompt, save_path)
+    
+    def build_dish_prompt(
+        self,
+        dish_name: str,
+        description: str,
+        ingredients: Optional[List[str]] = None,
+        cultural_context: str = "Tunisian Jewish Djerban",
+        cooking_method: str = "",
+        additional_styling: str = ""
+    ) -> str:
+        """Build the dish prompt (with ingredient-based colors) without generating."""
         # Analyze ingredients for accurate appearance
         appearance_desc = ""
         if ingredients:
@@ -427,15 +570,7 @@ Style requirements:
 
 The dish should look authentic, homemade yet beautifully presented,
 as if photographed for a high-end heritage cookbook."""
-
-        # Determine output path
-        if output_path:
-            save_path = Path(output_path)
-        else:
-            safe_name = dish_name.lower().replace(" ", "_").replace("'", "")
-            save_path = self.output_dir / f"{safe_name}_dish.png"
-        
-        return self._generate_and_save(prompt, save_path)
+        return prompt
     
     def generate_ingredients_image(
         self,
@@ -456,8 +591,26 @@ as if photographed for a high-end heritage cookbook."""
         Returns:
             Path to the saved image
         """
-        client = self._get_client()
+        self._get_backend()
         
+        prompt = self.build_ingredients_prompt(dish_name, ingredients, additional_styling)
+        
+        # Determine output path
+        if output_path:
+            save_path = Path(output_path)
+        else:
+            safe_name = dish_name.lower().replace(" ", "_").replace("'", "")
+            save_path = self.output_dir / f"{safe_name}_ingredients.png"
+        
+        return self._generate_and_save(prompt, save_path)
+    
+    def build_ingredients_prompt(
+        self,
+        dish_name: str,
+        ingredients: List[str],
+        additional_styling: str = ""
+    ) -> str:
+        """Build the ingredients flat-lay prompt without generating."""
         # Format ingredients list
         ingredients_text = ", ".join(ingredients)
         
@@ -474,15 +627,7 @@ Style requirements:
 
 Arrange ingredients in an artistic, balanced composition
 that showcases the fresh, quality ingredients used in this traditional recipe."""
-
-        # Determine output path
-        if output_path:
-            save_path = Path(output_path)
-        else:
-            safe_name = dish_name.lower().replace(" ", "_").replace("'", "")
-            save_path = self.output_dir / f"{safe_name}_ingredients.png"
-        
-        return self._generate_and_save(prompt, save_path)
+        return prompt
     
     def generate_custom_image(
         self,
@@ -522,38 +667,31 @@ high-end cookbook quality, 8K detail, photorealistic."""
         Returns:
             Path to the saved image
         """
-        client = self._get_client()
-        types = self._types
+        backend = self._get_backend()
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ImageCache.make_key(
+                model=self.MODEL,
+                prompt=prompt,
+                aspect_ratio=self.ASPECT_RATIO,
+                size=self.RESOLUTION,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                backend.save(cached, save_path)
+                print(f"♻️  Cache hit: {save_path}")
+                return save_path
         
         print(f"🎨 Generating image: {save_path.name}")
         print(f"   Prompt preview: {prompt[:100]}...")
         
         try:
-            response = client.models.generate_content(
-                model=self.MODEL,
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=self.ASPECT_RATIO,
-                        image_size=self.RESOLUTION
-                    ),
-                )
-            )
-            
-            # Process response
-            image_saved = False
-            for part in response.parts:
-                if part.text is not None:
-                    print(f"   Model note: {part.text[:100]}...")
-                elif image := part.as_image():
-                    save_path.parent.mkdir(parents=True, exist_ok=True)
-                    image.save(str(save_path))
-                    image_saved = True
-                    print(f"✅ Image saved: {save_path}")
-            
-            if not image_saved:
-                raise RuntimeError("No image was generated in the response")
+            image_data = backend.generate(prompt, aspect_ratio=self.ASPECT_RATIO, size=self.RESOLUTION)
+            if cache_key is not None:
+                self.cache.put(cache_key, image_data)
+            backend.save(image_data, save_path)
+            print(f"✅ Image saved: {save_path}")
             
             return save_path
             
@@ -579,54 +717,236 @@ high-end cookbook quality, 8K detail, photorealistic."""
         Returns:
             Dict with paths to generated images
         """
+        self._get_backend()
+        
+        _, jobs = self.plan_recipe_images(recipe_data, generate_dish, generate_ingredients)
+        recipe_hash = self._recipe_hash(recipe_data)
         results = {}
+        try:
+            for kind, (prompt, save_path) in jobs.items():
+                results[kind] = self._generate_and_save(prompt, save_path)
+                self.index.mark_generated(recipe_hash, kind, save_path)
+        finally:
+            self.index.save()
+        return results
+    
+    def plan_recipe_images(
+        self,
+        recipe_data: dict,
+        generate_dish: bool = True,
+        generate_ingredients: bool = True
+    ) -> Tuple[str, Dict[str, Tuple[str, Path]]]:
+        """
+        Work out the prompts and output paths for a recipe without generating.
         
-        # Get English name and description
-        name = recipe_data.get('name', {})
-        if isinstance(name, dict):
-            dish_name = name.get('en', name.get('he', 'dish'))
-        else:
-            dish_name = str(name)
+        Returns:
+            (recipe_id, jobs) where jobs maps 'dish'/'ingredients' to
+            (prompt, save_path).
+        """
+        entry = self.analyze_recipe(recipe_data)
+        recipe_id = entry['recipe_id']
+        jobs = {}
         
-        description = recipe_data.get('description', {})
-        if isinstance(description, dict):
-            dish_desc = description.get('en', '')
-        else:
-            dish_desc = str(description)
+        # Dish image with ingredient-accurate colors
+        if generate_dish:
+            jobs['dish'] = (entry['prompts']['dish'], self.output_dir / f"{recipe_id}_dish.png")
         
-        # Get ingredients list (English)
-        ingredients = recipe_data.get('ingredients', {})
-        if isinstance(ingredients, dict):
-            ingredients_list = ingredients.get('en', [])
-        else:
-            ingredients_list = ingredients if isinstance(ingredients, list) else []
+        # Ingredients image
+        if generate_ingredients and 'ingredients' in entry['prompts']:
+            jobs['ingredients'] = (
+                entry['prompts']['ingredients'],
+                self.output_dir / f"{recipe_id}_ingredients.png",
+            )
+        
+        return recipe_id, jobs
+    
+    def _recipe_hash(self, recipe_data: dict) -> str:
+        """Index key: recipe content plus the style text baked into the prompts."""
+        return self.index.recipe_hash(
+            recipe_data, dish_style=self.DISH_STYLE, ingredients_style=self.INGREDIENTS_STYLE
+        )
+    
+    def analyze_recipe(self, recipe_data: dict) -> dict:
+        """
+        Color analysis, cooking method and prompts for a recipe.
+        
+        Served from the persistent index when this exact recipe content was
+        analyzed before; otherwise computed and added to the index (call
+        ``self.index.save()`` to persist it).
+        
+        Returns:
+            Dict with recipe_id, dish_name, ingredients, cooking_method,
+            color_description, dominant_colors, liquid_base, all_colors,
+            prompts ({'dish': ..., 'ingredients': ...}) and cached (bool).
+        """
+        recipe_hash = self._recipe_hash(recipe_data)
+        entry = self.index.get(recipe_hash)
+        if entry is not None and 'prompts' in entry:
+            return {**entry, 'hash': recipe_hash, 'cached': True}
+        
+        dish_name, dish_desc, ingredients_list = recipe_fields(recipe_data)
         
         # Try to detect cooking method from steps/instructions
         cooking_method = self._detect_cooking_method(recipe_data)
+        analysis = AppearanceAnalyzer.analyze_ingredients(ingredients_list)
         
-        recipe_id = recipe_data.get('id', dish_name.lower().replace(" ", "_"))
-        
-        # Generate dish image with ingredient-accurate colors
-        if generate_dish:
-            dish_path = self.output_dir / f"{recipe_id}_dish.png"
-            results['dish'] = self.generate_dish_image(
+        prompts = {
+            'dish': self.build_dish_prompt(
                 dish_name=dish_name,
                 description=dish_desc,
                 ingredients=ingredients_list,
                 cooking_method=cooking_method,
-                output_path=str(dish_path)
+            ),
+        }
+        if ingredients_list:
+            prompts['ingredients'] = self.build_ingredients_prompt(
+                dish_name=dish_name, ingredients=ingredients_list
             )
         
-        # Generate ingredients image
-        if generate_ingredients and ingredients_list:
-            ing_path = self.output_dir / f"{recipe_id}_ingredients.png"
-            results['ingredients'] = self.generate_ingredients_image(
-                dish_name=dish_name,
-                ingredients=ingredients_list,
-                output_path=str(ing_path)
-            )
+        entry = {
+            'recipe_id': recipe_data.get('id', dish_name.lower().replace(" ", "_")),
+            'dish_name': dish_name,
+            'ingredients': ingredients_list,
+            'cooking_method': cooking_method,
+            'color_description': analysis['color_description'],
+            'dominant_colors': analysis['dominant_colors'],
+            'liquid_base': analysis['liquid_base'],
+            'all_colors': [list(c) for c in analysis['all_colors']],
+            'prompts': prompts,
+        }
+        self.index.put(recipe_hash, entry)
+        return {**entry, 'hash': recipe_hash, 'cached': False}
+    
+    def generate_recipes_batch(
+        self,
+        recipes: Iterable[dict],
+        generate_dish: bool = True,
+        generate_ingredients: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        changed_only: bool = False,
+        max_in_flight: Optional[int] = None,
+        on_image: Optional[Callable[[str, str, Path], None]] = None,
+        save_every: int = 100,
+    ) -> Dict[str, int]:
+        """
+        Generate images for many recipes with one global concurrency limit.
         
-        return results
+        Recipes are pulled from ``recipes`` only as fast as images finish:
+        at most ``max_in_flight`` images are queued or running at any time,
+        and finished images are handed to ``on_image`` rather than
+        collected, so the batch's working state stays flat however long
+        the recipe stream is; only a prompt-hash to first-output-path map
+        grows with the number of distinct images. At most ``max_workers``
+        Gemini requests run at once across the whole cookbook. Identical
+        prompts (e.g. the same recipe listed twice) are generated once, and
+        the first image is copied to every later output path, whether it is
+        still generating or long finished. Generation also goes through the
+        on-disk ImageCache, so a re-run only pays for changed prompts. A
+        failed image does not stop the rest of the batch. The recipe index
+        is saved every ``save_every`` recipes, so an interrupted run keeps
+        its progress.
+        
+        Args:
+            recipes: Recipe dicts, e.g. from iter_recipes().
+            generate_dish: Whether to generate dish images.
+            generate_ingredients: Whether to generate ingredients images.
+            max_workers: Maximum concurrent Gemini requests.
+            changed_only: Skip images already generated from identical
+                          recipe content (per the recipe index).
+            max_in_flight: Maximum images submitted but not yet finished.
+                           Defaults to 2 * max_workers.
+            on_image: Called as on_image(recipe_id, kind, path) for every
+                      image that is ready (generated, copied or unchanged).
+            save_every: Recipes between saves of the recipe index.
+            
+        Returns:
+            Counts: recipes, total, generated, reused, unchanged, failed.
+        """
+        self._get_backend()
+        max_workers = max(1, max_workers)
+        max_in_flight = max(max_workers, max_in_flight or 2 * max_workers)
+        
+        print("\n" + "═" * 60)
+        print(f"COOKBOOK BATCH GENERATION ({max_workers} concurrent)")
+        print(f"Output: {self.output_dir}")
+        print("═" * 60 + "\n")
+        
+        save_every = max(1, save_every)
+        finished: Dict[str, Path] = {}   # prompt hash -> first image generated this run
+        running = {}                      # prompt hash -> future generating it
+        targets = {}                      # future -> (prompt hash, [(recipe_id, kind, save_path, recipe_hash), ...])
+        counts = dict(recipes=0, total=0, generated=0, reused=0, unchanged=0, failed=0)
+        batch_start = time.time()
+        
+        def deliver(source: Path, recipe_id: str, kind: str, save_path: Path, recipe_hash: str):
+            if save_path != source:
+                save_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, save_path)
+            self.index.mark_generated(recipe_hash, kind, save_path)
+            if on_image is not None:
+                on_image(recipe_id, kind, save_path)
+        
+        def drain(block_until: int):
+            """Collect finished images until at most block_until remain in flight."""
+            while len(targets) > block_until:
+                done, _ = wait(targets, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prompt_hash, waiting = targets.pop(future)
+                    del running[prompt_hash]
+                    try:
+                        source = future.result()
+                    except Exception as e:
+                        counts['failed'] += len(waiting)
+                        for recipe_id, kind, _, _ in waiting:
+                            print(f"⚠️  Failed {recipe_id} ({kind}): {e}")
+                        continue
+                    counts['generated'] += 1
+                    finished[prompt_hash] = source
+                    for target in waiting:
+                        deliver(source, *target)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cookbook") as pool:
+                for recipe_data in recipes:
+                    counts['recipes'] += 1
+                    if counts['recipes'] % save_every == 0:
+                        self.index.save()
+                    recipe_id, jobs = self.plan_recipe_images(recipe_data, generate_dish, generate_ingredients)
+                    recipe_hash = self._recipe_hash(recipe_data)
+                    for kind, (prompt, save_path) in jobs.items():
+                        counts['total'] += 1
+                        if changed_only and self.index.is_generated(recipe_hash, kind, save_path):
+                            counts['unchanged'] += 1
+                            if on_image is not None:
+                                on_image(recipe_id, kind, save_path)
+                            continue
+                        
+                        target = (recipe_id, kind, save_path, recipe_hash)
+                        prompt_hash = ImageCache.make_key(prompt=prompt)
+                        if prompt_hash in finished:
+                            counts['reused'] += 1
+                            deliver(finished[prompt_hash], *target)
+                        elif prompt_hash in running:
+                            counts['reused'] += 1
+                            targets[running[prompt_hash]][1].append(target)
+                        else:
+                            drain(max_in_flight - 1)
+                            future = pool.submit(self._generate_and_save, prompt, save_path)
+                            running[prompt_hash] = future
+                            targets[future] = (prompt_hash, [target])
+                
+                drain(0)
+        finally:
+            self.index.save()
+        
+        print("\n" + "═" * 60)
+        print(f"COMPLETE: {counts['total'] - counts['failed']}/{counts['total']} images "
+              f"for {counts['recipes']} recipes in {time.time() - batch_start:.1f}s")
+        print(f"   {counts['generated']} generated, {counts['reused']} duplicate prompts reused, "
+              f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+        print("═" * 60)
+        
+        return counts
     
     def _detect_cooking_method(self, recipe_data: dict) -> str:
         """Extract cooking method from recipe steps if available."""
@@ -672,35 +992,154 @@ high-end cookbook quality, 8K detail, photorealistic."""
         return ' '.join(set(cooking_keywords))
 
 
-def analyze_recipe_colors(recipe_path: str) -> None:
+def recipe_fields(recipe_data: dict) -> Tuple[str, str, List[str]]:
     """
-    Preview the color analysis for a recipe without generating an image.
-    Useful for debugging and understanding color decisions.
+    English dish name, description and ingredient list of a recipe.
+    
+    Handles both plain values and {'en': ..., 'he': ...} translations.
     """
-    import json
+    # Get English name and description
+    name = recipe_data.get('name', {})
+    if isinstance(name, dict):
+        dish_name = name.get('en', name.get('he', 'dish'))
+    else:
+        dish_name = str(name)
     
-    with open(recipe_path, 'r', encoding='utf-8') as f:
-        recipe = json.load(f)
+    description = recipe_data.get('description', {})
+    if isinstance(description, dict):
+        dish_desc = description.get('en', '')
+    else:
+        dish_desc = str(description)
     
-    # Get ingredients
-    ingredients = recipe.get('ingredients', {})
+    # Get ingredients list (English)
+    ingredients = recipe_data.get('ingredients', {})
     if isinstance(ingredients, dict):
         ingredients_list = ingredients.get('en', [])
     else:
         ingredients_list = ingredients if isinstance(ingredients, list) else []
     
-    print(f"\n🔍 Color Analysis for: {recipe.get('name', {}).get('en', 'Unknown')}")
+    return dish_name, dish_desc, ingredients_list
+
+
+def _iter_json_values(f, chunk_size: int = 1 << 16) -> Iterator:
+    """
+    Incrementally parse a text stream of JSON.
+    
+    A stream starting with '[' yields the array's elements one by one;
+    anything else yields consecutive top-level values (a single object,
+    JSON Lines, or concatenated objects). Only one chunk plus the value
+    being decoded is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    in_array = None
+    # Inside an array: what may come next ("first" = a value or ']')
+    expect = "first"
+    
+    while True:
+        buffer = buffer.lstrip()
+        if in_array and buffer and expect != "value":
+            if buffer[0] == "]":
+                return
+            if expect == "separator":
+                if buffer[0] != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, 0)
+                buffer = buffer[1:]
+                expect = "value"
+                continue
+        if in_array and expect == "value" and buffer[:1] in (",", "]"):
+            raise json.JSONDecodeError("Expecting value", buffer, 0)
+        
+        found = False
+        if buffer and in_array is not None:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A value ending exactly at the buffer edge (e.g. a number)
+                # may continue in the next chunk
+                found = end < len(buffer) or eof
+        
+        if not found:
+            if eof:
+                if in_array:
+                    raise ValueError("Unterminated JSON array")
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            if in_array is None and buffer.lstrip():
+                buffer = buffer.lstrip()
+                in_array = buffer[0] == "["
+                if in_array:
+                    buffer = buffer[1:]
+            continue
+        
+        yield value
+        buffer = buffer[end:]
+        expect = "separator"
+
+
+def iter_recipes(source: str, pattern: str = "*.json*") -> Iterator[dict]:
+    """
+    Stream recipes from a file or a directory of files.
+    
+    Each file may hold one recipe object, a JSON array of recipes, or JSON
+    Lines (one recipe per line); arrays and lines are parsed incrementally,
+    so a cookbook-sized file is never loaded whole. Directories are read
+    file by file. Unreadable files are reported and skipped.
+    
+    Args:
+        source: Recipe file, or directory of recipe files.
+        pattern: Glob pattern for files inside a directory (.json and .jsonl).
+    """
+    source = Path(source)
+    paths = sorted(source.glob(pattern)) if source.is_dir() else [source]
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for recipe in _iter_json_values(f):
+                    if isinstance(recipe, dict):
+                        yield recipe
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path.name}: {e}")
+
+
+def analyze_recipe_colors(recipe_path: str, generator: Optional["CookbookImageGenerator"] = None) -> None:
+    """
+    Preview the color analysis for recipes without generating images.
+    Useful for debugging and understanding color decisions.
+    
+    recipe_path may be a recipe file (object, array or JSON Lines) or a
+    directory; recipes are streamed one at a time. Results come from (and
+    are added to) the generator's recipe index, so previewing an unchanged
+    recipe does no analysis work.
+    """
+    generator = generator or CookbookImageGenerator()
+    
+    try:
+        for recipe in iter_recipes(recipe_path):
+            _print_recipe_analysis(generator.analyze_recipe(recipe))
+    finally:
+        generator.index.save()
+
+
+def _print_recipe_analysis(analysis: dict) -> None:
+    """Print one analyze_recipe() result."""
+    print(f"\n🔍 Color Analysis for: {analysis['dish_name']}{' (cached)' if analysis['cached'] else ''}")
     print("=" * 60)
     print(f"\nIngredients analyzed:")
-    for ing in ingredients_list:
+    for ing in analysis['ingredients']:
         print(f"  • {ing}")
     
-    analysis = AppearanceAnalyzer.analyze_ingredients(ingredients_list)
-    
     print(f"\n🎨 Color Analysis Results:")
     print(f"   Primary description: {analysis['color_description']}")
     print(f"   Dominant colors: {', '.join(analysis['dominant_colors']) if analysis['dominant_colors'] else 'None detected'}")
     print(f"   Liquid base: {analysis['liquid_base'] or 'Not detected'}")
+    print(f"   Cooking method: {analysis['cooking_method'] or 'Not detected'}")
     
     if analysis['all_colors']:
         print(f"\n   All detected colors (by intensity):")
@@ -714,7 +1153,6 @@ def analyze_recipe_colors(recipe_path: str) -> None:
 def main():
     """Demo and testing entry point."""
     import argparse
-    import json
     
     parser = argparse.ArgumentParser(
         description="Generate cookbook images using Gemini 3 Pro"
@@ -735,7 +1173,23 @@ def main():
     )
     parser.add_argument(
         "--recipe-json",
-        help="Path to recipe JSON file to generate images from"
+        help="Recipe file to generate images from (one recipe, a JSON array, or JSON Lines)"
+    )
+    parser.add_argument(
+        "--recipes-dir",
+        help="Directory of recipe files (or one large .json/.jsonl) to generate in one batch"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=CookbookImageGenerator.DEFAULT_MAX_WORKERS,
+        help="Concurrent image generations for --recipes-dir "
+             f"(default: {CookbookImageGenerator.DEFAULT_MAX_WORKERS})"
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="With --recipes-dir, skip recipes unchanged since their images were generated"
     )
     parser.add_argument(
         "--output-dir",
@@ -763,14 +1217,14 @@ def main():
     
     args = parser.parse_args()
     
+    # Initialize generator
+    gen = CookbookImageGenerator(output_dir=args.output_dir)
+    
     # Analyze mode - preview colors without generating
     if args.analyze:
-        analyze_recipe_colors(args.analyze)
+        analyze_recipe_colors(args.analyze, gen)
         return
     
-    # Initialize generator
-    gen = CookbookImageGenerator(output_dir=args.output_dir)
-    
     if args.test:
         print("🧪 Running test generation with ingredient-based colors...")
         
@@ -800,30 +1254,33 @@ def main():
         print(f"✅ Test complete: {result}")
         return
     
-    if args.recipe_json:
-        # Load recipe from JSON and generate images
-        with open(args.recipe_json, 'r', encoding='utf-8') as f:
-            recipe_data = json.load(f)
-        
-        # Show color analysis
-        ingredients = recipe_data.get('ingredients', {})
-        if isinstance(ingredients, dict):
-            ing_list = ingredients.get('en', [])
-        else:
-            ing_list = ingredients if isinstance(ingredients, list) else []
-        
-        if ing_list:
-            analysis = AppearanceAnalyzer.analyze_ingredients(ing_list)
-            print(f"\n🎨 Detected colors: {analysis['color_description']}")
-        
-        results = gen.generate_recipe_images(
-            recipe_data,
+    if args.recipes_dir:
+        counts = gen.generate_recipes_batch(
+            iter_recipes(args.recipes_dir),
             generate_dish=not args.ingredients_only,
-            generate_ingredients=not args.dish_only
+            generate_ingredients=not args.dish_only,
+            max_workers=args.workers,
+            changed_only=args.changed_only,
         )
-        print(f"\n✅ Generated {len(results)} images:")
-        for key, path in results.items():
-            print(f"   {key}: {path}")
+        print(f"\n✅ Generated images for {counts['recipes']} recipes")
+        return
+    
+    if args.recipe_json:
+        # Stream recipes from the file (one object, an array, or JSON Lines)
+        for recipe_data in iter_recipes(args.recipe_json):
+            # Show color analysis
+            analysis = gen.analyze_recipe(recipe_data)
+            if analysis['ingredients']:
+                print(f"\n🎨 Detected colors: {analysis['color_description']}")
+            
+            results = gen.generate_recipe_images(
+                recipe_data,
+                generate_dish=not args.ingredients_only,
+                generate_ingredients=not args.dish_only
+            )
+            print(f"\n✅ Generated {len(results)} images:")
+            for key, path in results.items():
+                print(f"   {key}: {path}")
         return
     
     if args.dish:
@@ -848,7 +1305,7 @@ def main():
         )
         print(f"✅ Generated ingredients image: {result}")
     
-    if not any([args.dish, args.ingredients, args.recipe_json, args.test, args.analyze]):
+    if not any([args.dish, args.ingredients, args.recipe_json, args.recipes_dir, args.test, args.analyze]):
         parser.print_help()
 
 
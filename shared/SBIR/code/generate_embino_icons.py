@@ -4,13 +4,17 @@ Generate small icons for embino.com in circuit/terminal aesthetic.
 Green lines on black, geometric, minimal.
 """
 
-import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lib.gemini_backend import GeminiBackend
+
 # Icons needed:
 # Pipeline: write, gear, package, plug
 # Use cases: lightbulb, thermometer, robot
@@ -83,18 +87,7 @@ ICONS = {
 
 def generate_icons(output_dir: Path):
     """Generate all icons."""
-    try:
-        from google import genai
-        from google.genai import types
-    except ImportError:
-        print("❌ google-genai not installed")
-        sys.exit(1)
-    
-    api_key = os.getenv('GOOGLE_API_KEY')
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY not found")
-    
-    client = genai.Client(api_key=api_key)
+    backend = GeminiBackend()
     output_dir.mkdir(parents=True, exist_ok=True)
     
     for name, data in ICONS.items():
@@ -104,26 +97,10 @@ def generate_icons(output_dir: Path):
         prompt = data["prompt"] + "\n\nCRITICAL: Pure geometric line art. No photorealism. No 3D rendering. Just clean vector-like lines on black."
         
         try:
-            response = client.models.generate_content(
-                model="gemini-3-pro-image-preview",
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio="1:1",
-                        image_size="256"
-                    ),
-                )
-            )
+            image_data = backend.generate(prompt, aspect_ratio="1:1", size="256")
+            backend.save(image_data, save_path)
+            print(f"✅ Saved: {save_path}")
             
-            for part in response.parts:
-                if part.text:
-                    print(f"   Note: {part.text[:50]}...")
-                elif image := part.as_image():
-                    image.save(str(save_path))
-                    print(f"✅ Saved: {save_path}")
-                    break
-                    
         except Exception as e:
             print(f"❌ Error: {e}")
 
@@ -23,6 +23,9 @@ Usage:
     
     # Single image
     python generate_embino_images.py --image hero_circuit
+    
+    # Re-run after a crash: skip images that already finished
+    python generate_embino_images.py --all --resume
 """
 
 import os
@@ -33,6 +36,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Add shared/ to path to import lib
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lib.gemini_backend import GeminiBackend
+from lib.image_cache import ImageCache
+from lib.manifest import JobManifest
+
 
 class EmbinoImageGenerator:
     """
@@ -41,6 +51,7 @@ class EmbinoImageGenerator:
     """
     
     MODEL = "gemini-3-pro-image-preview"
+    RESOLUTION = "2K"
     
     # Output settings
     ASPECT_RATIOS = {
@@ -307,9 +318,7 @@ class EmbinoImageGenerator:
     
     def __init__(self, output_dir: Optional[str] = None):
         """Initialize the generator."""
-        self._client = None
-        self._genai = None
-        self._types = None
+        self._backend = None
         
         if output_dir:
             self.output_dir = Path(output_dir)
@@ -318,20 +327,13 @@ class EmbinoImageGenerator:
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
         print(f"📁 Output directory: {self.output_dir}")
+        
+        # Per-image status for resumable runs (see lib.manifest)
+        self.manifest = JobManifest.for_output_dir(self.output_dir)
     
-    def _get_client(self):
-        """Lazy load the genai client."""
-        if self._client is None:
-            try:
-                from google import genai
-                from google.genai import types
-                self._genai = genai
-                self._types = types
-            except ImportError:
-                print("❌ google-genai package not installed.")
-                print("Install with: pip install google-genai")
-                sys.exit(1)
-            
+    def _get_backend(self) -> GeminiBackend:
+        """Lazy load the shared Gemini backend."""
+        if self._backend is None:
             api_key = os.getenv('GOOGLE_API_KEY')
             if not api_key or api_key == 'your_google_api_key_here':
                 raise ValueError(
@@ -339,17 +341,13 @@ class EmbinoImageGenerator:
                     "Please set it in your .env file."
                 )
             
-            self._client = genai.Client(api_key=api_key)
+            self._backend = GeminiBackend(api_key=api_key, model=self.MODEL)
         
-        return self._client
+        return self._backend
     
-    def generate_image(self, name: str, prompt_data: dict) -> Path:
-        """Generate a single image from prompt data."""
-        client = self._get_client()
-        types = self._types
-        
+    def _build_prompt(self, prompt_data: dict) -> str:
+        """Prompt text with the style reinforcement appended."""
         prompt = prompt_data["prompt"]
-        aspect = self.ASPECT_RATIOS[prompt_data["aspect"]]
         style = prompt_data["style"]
         
         # Add style reinforcement
@@ -358,52 +356,59 @@ class EmbinoImageGenerator:
         elif style == "abstract":
             prompt += "\n\nCRITICAL: Pure geometric abstraction. Vector-clean edges. No organic shapes. Mathematical precision. No photorealistic elements."
         
+        return prompt
+    
+    def _request_hash(self, prompt_data: dict) -> str:
+        """Hash of everything that determines an image, for the job manifest."""
+        return ImageCache.make_key(
+            model=self.MODEL,
+            prompt=self._build_prompt(prompt_data),
+            aspect_ratio=self.ASPECT_RATIOS[prompt_data["aspect"]],
+            size=self.RESOLUTION,
+        )
+    
+    def is_done(self, name: str, prompt_data: dict) -> bool:
+        """Whether the manifest records this exact image as already generated."""
+        return self.manifest.is_complete(
+            name, self._request_hash(prompt_data), self.output_dir / f"{name}.png"
+        )
+    
+    def generate_image(self, name: str, prompt_data: dict) -> Path:
+        """Generate a single image from prompt data."""
+        backend = self._get_backend()
+        
+        prompt = self._build_prompt(prompt_data)
+        aspect = self.ASPECT_RATIOS[prompt_data["aspect"]]
+        style = prompt_data["style"]
+        
         save_path = self.output_dir / f"{name}.png"
+        self.manifest.start(name, self._request_hash(prompt_data), save_path)
         
         print(f"\n🎨 Generating: {name}")
         print(f"   Style: {style} | Aspect: {aspect}")
         print(f"   Prompt preview: {prompt[:80]}...")
         
         try:
-            response = client.models.generate_content(
-                model=self.MODEL,
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect,
-                        image_size="2K"
-                    ),
-                )
-            )
-            
-            image_saved = False
-            for part in response.parts:
-                if part.text is not None:
-                    print(f"   Model note: {part.text[:100]}...")
-                elif image := part.as_image():
-                    save_path.parent.mkdir(parents=True, exist_ok=True)
-                    image.save(str(save_path))
-                    image_saved = True
-                    print(f"✅ Saved: {save_path}")
-            
-            if not image_saved:
-                raise RuntimeError("No image was generated in the response")
+            image_data = backend.generate(prompt, aspect_ratio=aspect, size=self.RESOLUTION)
+            backend.save(image_data, save_path)
+            print(f"✅ Saved: {save_path}")
             
+            self.manifest.done(name)
             return save_path
             
         except Exception as e:
+            self.manifest.fail(name, e)
             print(f"❌ Error generating {name}: {e}")
             raise
     
-    def generate_geometric(self) -> dict:
-        """Generate all geometric/abstract images."""
+    def _generate_set(self, prompts: dict, resume: bool) -> dict:
+        """Generate a set of images, skipping finished ones when resuming."""
         results = {}
-        print("\n" + "═" * 60)
-        print("GENERATING GEOMETRIC/ABSTRACT IMAGES")
-        print("═" * 60)
-        
-        for name, prompt_data in self.GEOMETRIC_PROMPTS.items():
+        for name, prompt_data in prompts.items():
+            if resume and self.is_done(name, prompt_data):
+                results[name] = self.output_dir / f"{name}.png"
+                print(f"⏭️  Skipping {name} (already generated)")
+                continue
             try:
                 results[name] = self.generate_image(name, prompt_data)
             except Exception as e:
@@ -411,26 +416,33 @@ class EmbinoImageGenerator:
         
         return results
     
-    def generate_hardware(self) -> dict:
+    def generate_geometric(self, resume: bool = False) -> dict:
+        """Generate all geometric/abstract images."""
+        print("\n" + "═" * 60)
+        print("GENERATING GEOMETRIC/ABSTRACT IMAGES")
+        print("═" * 60)
+        
+        return self._generate_set(self.GEOMETRIC_PROMPTS, resume)
+    
+    def generate_hardware(self, resume: bool = False) -> dict:
         """Generate all photorealistic hardware images."""
-        results = {}
         print("\n" + "═" * 60)
         print("GENERATING PHOTOREALISTIC HARDWARE IMAGES")
         print("═" * 60)
         
-        for name, prompt_data in self.HARDWARE_PROMPTS.items():
-            try:
-                results[name] = self.generate_image(name, prompt_data)
-            except Exception as e:
-                print(f"⚠️  Failed {name}: {e}")
-        
-        return results
+        return self._generate_set(self.HARDWARE_PROMPTS, resume)
     
-    def generate_all(self) -> dict:
-        """Generate all images."""
+    def generate_all(self, resume: bool = False) -> dict:
+        """
+        Generate all images.
+        
+        Args:
+            resume: Skip images the manifest records as done for the same
+                    prompt, so a crashed run only retries what is missing.
+        """
         results = {}
-        results.update(self.generate_geometric())
-        results.update(self.generate_hardware())
+        results.update(self.generate_geometric(resume=resume))
+        results.update(self.generate_hardware(resume=resume))
         
         print("\n" + "═" * 60)
         print(f"COMPLETE: Generated {len(results)} images")
@@ -465,6 +477,7 @@ def main():
     parser.add_argument("--image", help="Generate a specific image by name")
     parser.add_argument("--list", action="store_true", help="List all available images")
     parser.add_argument("--output-dir", help="Output directory for images")
+    parser.add_argument("--resume", action="store_true", help="Skip images already generated by a previous run")
     
     args = parser.parse_args()
     
@@ -475,15 +488,15 @@ def main():
         return
     
     if args.all:
-        gen.generate_all()
+        gen.generate_all(resume=args.resume)
         return
     
     if args.geometric:
-        gen.generate_geometric()
+        gen.generate_geometric(resume=args.resume)
         return
     
     if args.hardware:
-        gen.generate_hardware()
+        gen.generate_hardware(resume=args.resume)
         return
     
     if args.image:
@@ -1,10 +1,67 @@
 """
 Shared library modules for website projects.
 
+Submodules are imported lazily (PEP 562): ``import lib`` costs almost
+nothing, and ``from lib import remove_background`` only loads the module
+that defines it. The shared .env is loaded on first ImageGenerator().
+
 Usage:
-    from lib.image_gen import ImageGenerator, generate_image, remove_background
+    from lib.image_gen import ImageGenerator, generate_image, remove_background, remove_background_batch
+    from lib.gemini_backend import GeminiBackend, get_genai_client
+    from lib.background import BackgroundRemover, get_background_remover
+    from lib.background_pool import remove_backgrounds_parallel
+    from lib.image_cache import ImageCache
+    from lib.image_pipeline import ImagePipeline
+    from lib.manifest import JobManifest
+    from lib.mail_merge import load_records, mail_merge
+    from lib.md_docx import md_to_docx, tokenize
+    from lib.patent_docs import FilingManifest, build_filings
+    from lib.doc_build import BuildStamp, BuildTarget, build_targets, markdown_inputs
+    from lib.html_pdf import PdfRenderService
+    from lib.weasy_render import WeasyRenderer
 """
 
-from .image_gen import ImageGenerator, generate_image, remove_background
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "BackgroundRemover": "background",
+    "get_background_remover": "background",
+    "remove_backgrounds_parallel": "background_pool",
+    "BuildStamp": "doc_build",
+    "BuildTarget": "doc_build",
+    "build_targets": "doc_build",
+    "markdown_inputs": "doc_build",
+    "GeminiBackend": "gemini_backend",
+    "get_genai_client": "gemini_backend",
+    "ImageCache": "image_cache",
+    "PdfRenderService": "html_pdf",
+    "ImageGenerator": "image_gen",
+    "generate_image": "image_gen",
+    "remove_background": "image_gen",
+    "remove_background_batch": "image_gen",
+    "ImagePipeline": "image_pipeline",
+    "JobManifest": "manifest",
+    "load_records": "mail_merge",
+    "mail_merge": "mail_merge",
+    "md_to_docx": "md_docx",
+    "tokenize": "md_docx",
+    "FilingManifest": "patent_docs",
+    "build_filings": "patent_docs",
+    "WeasyRenderer": "weasy_render",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
 
-__all__ = ["ImageGenerator", "generate_image", "remove_background"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Background Removal Sessions
+===========================
+Long-lived rembg sessions so the segmentation model is loaded once per
+process instead of on every call.
+
+``rembg.remove(img)`` without a session re-resolves the default model
+session each time. A BackgroundRemover owns an explicit session for one
+model; get_background_remover() hands out a shared, process-wide instance
+per model name.
+
+Usage:
+    from lib.background import BackgroundRemover, get_background_remover
+
+    # Shared session (used by ImageGenerator and remove_background)
+    remover = get_background_remover("isnet-general-use")
+    img_nobg = remover(img)
+
+    # Explicitly scoped session
+    with BackgroundRemover("u2net") as remover:
+        for img in images:
+            remover(img)
+"""
+
+import sys
+import threading
+from typing import Optional
+
+# rembg's own default model
+DEFAULT_REMBG_MODEL = "u2net"
+
+
+class BackgroundRemover:
+    """
+    A rembg model session that can be reused across many images.
+
+    The session is created on first use (the first call may download the
+    model weights). Instances are callable: ``remover(img) -> img``.
+
+    Attributes:
+        model: rembg model name (e.g. "u2net", "isnet-general-use", "birefnet-general").
+    """
+
+    def __init__(self, model: str = DEFAULT_REMBG_MODEL, verbose: bool = False):
+        """
+        Initialize the remover.
+
+        Args:
+            model: rembg model name.
+            verbose: Whether to print when the model session is loaded.
+        """
+        self.model = model
+        self.verbose = verbose
+        self._session = None
+        self._remove = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._session is not None else "not loaded"
+        return f"BackgroundRemover({self.model!r}, {state})"
+
+    def __enter__(self) -> "BackgroundRemover":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self) -> "BackgroundRemover":
+        """Create the rembg session now rather than on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    try:
+                        from rembg import new_session, remove
+                    except ImportError:
+                        print("❌ rembg not installed.")
+                        print("   Install with: pip install rembg")
+                        sys.exit(1)
+                    self._remove = remove
+                    self._session = new_session(self.model)
+                    if self.verbose:
+                        print(f"✅ rembg session loaded: {self.model}")
+        return self
+
+    def remove(self, img):
+        """Remove the background from a PIL image and return an RGBA image."""
+        self.load()
+        return self._remove(img, session=self._session)
+
+    __call__ = remove
+
+    def close(self):
+        """Drop the session so its model memory can be reclaimed."""
+        with self._lock:
+            self._session = None
+            self._remove = None
+
+
+_removers: dict[str, BackgroundRemover] = {}
+_removers_lock = threading.Lock()
+
+
+def get_background_remover(model: Optional[str] = None, verbose: bool = False) -> BackgroundRemover:
+    """
+    Return the process-wide BackgroundRemover for a model.
+
+    Every caller asking for the same model shares one session, so the model
+    is initialized at most once per process.
+
+    Args:
+        model: rembg model name. Defaults to DEFAULT_REMBG_MODEL.
+        verbose: Whether to print when the model session is loaded.
+    """
+    model = model or DEFAULT_REMBG_MODEL
+    with _removers_lock:
+        remover = _removers.get(model)
+        if remover is None:
+            remover = _removers[model] = BackgroundRemover(model, verbose=verbose)
+    return remover
+
+
+def close_background_removers():
+    """Release every shared session created by get_background_remover()."""
+    with _removers_lock:
+        for remover in _removers.values():
+            remover.close()
+        _removers.clear()
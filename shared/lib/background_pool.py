@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Parallel Background Removal
+===========================
+Shard rembg background removal across CPU cores.
+
+rembg inference is CPU-bound, so a single process only uses one core's
+worth of throughput for a large icon/logo set. This module runs
+remove_background() in a process pool where every worker loads the rembg
+model exactly once (in its initializer) and then processes its share of
+the files.
+
+Usage:
+    # CLI (from the shared/ directory)
+    python -m lib.background_pool SBIR/images --recursive --in-place
+    python -m lib.background_pool SBIR/images/team -o SBIR/images/team_nobg --workers 4
+
+    # Python
+    from lib.background_pool import remove_backgrounds_parallel
+    results = remove_backgrounds_parallel("SBIR/images/icons", "SBIR/images/icons_nobg")
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+try:
+    from .background import DEFAULT_REMBG_MODEL, BackgroundRemover, get_background_remover
+    from .image_gen import remove_background
+except ImportError:  # running this file directly as a script
+    from background import DEFAULT_REMBG_MODEL, BackgroundRemover, get_background_remover
+    from image_gen import remove_background
+
+
+# Per-process remover, created by _init_worker
+_worker_remover: Optional[BackgroundRemover] = None
+
+
+def _init_worker(model: str, threads_per_worker: int):
+    """Pool initializer: cap ONNX threads and preload the model once."""
+    global _worker_remover
+    # rembg sizes its onnxruntime thread pools from OMP_NUM_THREADS;
+    # without a cap every worker would try to use every core.
+    os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+    _worker_remover = get_background_remover(model).load()
+
+
+def _remove_one(src: Path, dst: Path) -> Tuple[Path, float]:
+    """Worker task: remove the background of one file."""
+    start = time.time()
+    remove_background(src, dst, verbose=False, remover=_worker_remover)
+    return dst, time.time() - start
+
+
+def collect_images(
+    input_dir: Union[str, Path],
+    pattern: str = "*.png",
+    recursive: bool = False,
+    exclude: Optional[Path] = None,
+) -> list[Path]:
+    """
+    List image files under input_dir matching pattern.
+
+    Args:
+        input_dir: Directory to scan.
+        pattern: Glob pattern for file names.
+        recursive: Whether to descend into subdirectories.
+        exclude: Directory whose contents are skipped (e.g. the output dir).
+    """
+    input_dir = Path(input_dir)
+    paths = input_dir.rglob(pattern) if recursive else input_dir.glob(pattern)
+    exclude = exclude.resolve() if exclude else None
+    return sorted(
+        p for p in paths
+        if p.is_file() and not (exclude and exclude in p.resolve().parents)
+    )
+
+
+def remove_backgrounds_parallel(
+    input_dir: Union[str, Path],
+    output_dir: Optional[Union[str, Path]] = None,
+    pattern: str = "*.png",
+    model: str = DEFAULT_REMBG_MODEL,
+    workers: Optional[int] = None,
+    recursive: bool = False,
+    in_place: bool = False,
+    verbose: bool = True,
+) -> dict[Path, Path]:
+    """
+    Remove backgrounds from a directory of images using a process pool.
+
+    Args:
+        input_dir: Directory containing the source images.
+        output_dir: Where results go, mirroring the input layout.
+                    Defaults to ``<input_dir>/nobg``. Ignored when in_place.
+        pattern: Glob pattern selecting input files.
+        model: rembg model name; each worker loads it once.
+        workers: Number of worker processes (default: CPU count).
+        recursive: Whether to include subdirectories.
+        in_place: Overwrite each input file with its transparent version.
+        verbose: Whether to print progress.
+
+    Returns:
+        Dict mapping each input path to its output path (failures omitted).
+    """
+    input_dir = Path(input_dir)
+    output_dir = input_dir if in_place else Path(output_dir) if output_dir else input_dir / "nobg"
+    files = collect_images(input_dir, pattern, recursive, exclude=None if in_place else output_dir)
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(files) or 1))
+    threads_per_worker = max(1, cpu_count // workers)
+
+    if verbose:
+        print(f"\n{'═' * 60}")
+        print(f"PARALLEL BACKGROUND REMOVAL: {len(files)} images")
+        print(f"Model: {model} | Workers: {workers} x {threads_per_worker} threads")
+        print(f"Input:  {input_dir}")
+        print(f"Output: {output_dir}")
+        print(f"{'═' * 60}\n")
+
+    results = {}
+    start = time.time()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model, threads_per_worker),
+    ) as pool:
+        futures = {}
+        for src in files:
+            dst = output_dir / src.relative_to(input_dir).with_suffix(".png")
+            futures[pool.submit(_remove_one, src, dst)] = src
+
+        for i, future in enumerate(as_completed(futures), 1):
+            src = futures[future]
+            try:
+                dst, elapsed = future.result()
+                results[src] = dst
+                if verbose:
+                    print(f"[{i}/{len(files)}] ✅ {src.relative_to(input_dir)} ({elapsed:.1f}s)")
+            except Exception as e:
+                if verbose:
+                    print(f"[{i}/{len(files)}] ⚠️  Failed {src.relative_to(input_dir)}: {e}")
+
+    if verbose:
+        elapsed = time.time() - start
+        rate = len(results) / elapsed if elapsed else 0.0
+        print(f"\nCOMPLETE: {len(results)}/{len(files)} images in {elapsed:.1f}s ({rate:.1f} img/s)")
+
+    return results
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Remove image backgrounds in parallel with rembg (one model per worker)"
+    )
+    parser.add_argument("input_dir", help="Directory containing images")
+    parser.add_argument("-o", "--output-dir", help="Output directory (default: <input_dir>/nobg)")
+    parser.add_argument("--pattern", default="*.png", help="Glob pattern for input files (default: *.png)")
+    parser.add_argument("--model", default=DEFAULT_REMBG_MODEL, help=f"rembg model (default: {DEFAULT_REMBG_MODEL})")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite input files")
+
+    args = parser.parse_args()
+
+    if not Path(args.input_dir).is_dir():
+        print(f"❌ Not a directory: {args.input_dir}")
+        sys.exit(1)
+
+    remove_backgrounds_parallel(
+        args.input_dir,
+        output_dir=args.output_dir,
+        pattern=args.pattern,
+        model=args.model,
+        workers=args.workers,
+        recursive=args.recursive,
+        in_place=args.in_place,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+=====================
+Measure how long ``import lib`` and typical CLI imports take, each in a
+fresh interpreter so nothing is already cached in sys.modules.
+
+The "eager" case touches the names the package exported before
+submodules were loaded lazily (EAGER_NAMES, all from lib.image_gen), which
+is what ``import lib`` used to cost. It deliberately ignores modules added
+to ``lib.__all__`` since, so the comparison does not overstate the saving.
+
+Usage:
+    # From the shared/ directory
+    python -m lib.bench_import
+    python -m lib.bench_import --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SHARED_DIR = Path(__file__).parent.parent
+
+# lib.__all__ before lazy loading: `import lib` imported exactly these
+EAGER_NAMES = ("ImageGenerator", "generate_image", "remove_background")
+
+CASES = {
+    "python (baseline)": "pass",
+    "import lib": "import lib",
+    "from lib import ImageCache": "from lib import ImageCache",
+    "from lib import remove_background": "from lib import remove_background",
+    "from lib.rate_limit import call_with_retry": "from lib.rate_limit import call_with_retry",
+    "eager (pre-lazy import lib)": f"import lib\nfor name in {EAGER_NAMES!r}: getattr(lib, name)",
+}
+
+_TIMER = """
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+
+def time_import(code: str, runs: int) -> list[float]:
+    """Run code in `runs` fresh interpreters and return the elapsed seconds of each."""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(code=code)],
+            cwd=SHARED_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "import failed")
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark import time of the shared lib package")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per case (default: 10)")
+    args = parser.parse_args()
+
+    print(f"\n{'═' * 60}")
+    print(f"IMPORT TIME: median of {args.runs} fresh interpreters")
+    print(f"{'═' * 60}\n")
+
+    for label, code in CASES.items():
+        try:
+            timings = time_import(code, args.runs)
+        except RuntimeError as e:
+            print(f"{label:<44} ⚠️  {e}")
+            continue
+        print(f"{label:<44} {statistics.median(timings) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
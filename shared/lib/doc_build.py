@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Parallel Document Build Driver
+==============================
+Render every PDF/DOCX target of a filing package in a process pool.
+
+weasyprint and python-docx are single-threaded, so converting a patent
+directory one document after another takes the sum of every render. Each
+target here runs in its own worker process, so the whole package takes
+roughly as long as its slowest document. Per-document wall times are
+printed as targets finish, followed by a summary.
+
+Converter functions must be module-level (so they can be pickled by
+reference) and take plain arguments, e.g. ``md_to_pdf(input, output)``.
+
+Usage:
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from lib.doc_build import BuildTarget, build_targets
+
+    if __name__ == '__main__':
+        build_targets([
+            BuildTarget('SPECIFICATION.pdf', md_to_pdf, ('draft.md', 'SPECIFICATION.pdf')),
+            BuildTarget('SPECIFICATION.docx', md_to_docx, ('draft.md', 'SPECIFICATION.docx')),
+            BuildTarget('CLAIMS.pdf', md_to_pdf, ('CLAIMS.md', 'CLAIMS.pdf')),
+        ])
+
+The ``if __name__ == '__main__'`` guard is required: on platforms that
+spawn workers (macOS, Windows) each worker re-imports the calling script.
+
+Incremental builds:
+    Pass a BuildStamp and give each target its inputs (markdown_inputs()
+    lists a markdown file plus the images it references) and a salt such
+    as the CSS it is rendered with. Targets whose inputs, salt and
+    arguments hash the same as on the last successful build, and whose
+    output still exists, are skipped.
+
+        stamp = BuildStamp.for_directory('.')
+        build_targets([
+            BuildTarget('CLAIMS.pdf', md_to_pdf, ('CLAIMS.md', 'CLAIMS.pdf'),
+                        inputs=markdown_inputs('CLAIMS.md'), salt=CSS_STYLE),
+        ], stamp=stamp)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+# ![alt](path "title") and <img src="path">
+_IMAGE_REF_RE = re.compile(
+    r'!\[[^\]]*\]\(\s*<?([^)\s>]+)'
+    r'|<img\b[^>]*?\bsrc\s*=\s*["\']([^"\']+)["\']',
+    re.IGNORECASE,
+)
+
+
+def markdown_inputs(md_path: Union[str, Path]) -> list[Path]:
+    """
+    A markdown file plus every local image it references.
+
+    Remote (``scheme://``) and ``data:`` references are ignored. Missing
+    local images are still listed so that adding one later changes the
+    hash.
+
+    Args:
+        md_path: Markdown source file.
+
+    Returns:
+        [md_path, *image paths], images resolved relative to md_path.
+    """
+    md_path = Path(md_path)
+    inputs = [md_path]
+    if not md_path.exists():
+        return inputs
+
+    seen = set()
+    for match in _IMAGE_REF_RE.finditer(md_path.read_text()):
+        ref = match.group(1) or match.group(2)
+        if "://" in ref or ref.startswith("data:") or ref in seen:
+            continue
+        seen.add(ref)
+        inputs.append(md_path.parent / ref)
+    return inputs
+
+
+def _function_id(func: Callable) -> str:
+    """Dotted name of a function; ``python -m pkg.mod`` reports pkg.mod, not __main__."""
+    module = func.__module__
+    if module == "__main__":
+        spec = getattr(sys.modules["__main__"], "__spec__", None)
+        module = spec.name if spec is not None else module
+    return f"{module}.{func.__qualname__}"
+
+
+@dataclass
+class BuildTarget:
+    """
+    One output document and the call that produces it.
+
+    Attributes:
+        name: Label used in progress output (usually the output file name).
+        func: Module-level converter function.
+        args: Positional arguments for func.
+        kwargs: Keyword arguments for func.
+        output: File the target writes. Defaults to name.
+        inputs: Files whose contents the output depends on.
+        salt: Anything else the output depends on (e.g. the CSS).
+        stamp: Build stamp for this target, overriding the one passed to
+               build_targets() (lets one build span several directories).
+    """
+
+    name: str
+    func: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    output: Optional[Union[str, Path]] = None
+    inputs: list = field(default_factory=list)
+    salt: str = ""
+    stamp: Optional["BuildStamp"] = None
+
+    @property
+    def output_path(self) -> Path:
+        return Path(self.output or self.name)
+
+    def digest(self) -> str:
+        """Hash of the converter, its arguments, the salt and every input file."""
+        h = hashlib.sha256()
+        h.update(_function_id(self.func).encode())
+        h.update(repr((self.args, sorted(self.kwargs.items()))).encode())
+        h.update(self.salt.encode())
+        for path in self.inputs:
+            path = Path(path)
+            h.update(str(path).encode())
+            try:
+                h.update(path.read_bytes())
+            except FileNotFoundError:
+                h.update(b"\0missing")
+        return h.hexdigest()
+
+
+class BuildStamp:
+    """
+    Input hashes of the last successful build of each target, as JSON.
+
+    Attributes:
+        FILENAME: Stamp file name used by for_directory().
+        path: Location of the stamp file.
+        digests: Mapping of output path (relative to the stamp file) to
+                 input hash.
+    """
+
+    FILENAME = ".build_stamp.json"
+    VERSION = 1
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Load a stamp file, or start empty if it does not exist.
+
+        Args:
+            path: Stamp file location.
+        """
+        self.path = Path(path)
+        self.digests: dict[str, str] = {}
+
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == self.VERSION:
+                    self.digests = data.get("targets", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️  Ignoring unreadable build stamp {self.path}: {e}")
+
+    @classmethod
+    def for_directory(cls, directory: Union[str, Path]) -> "BuildStamp":
+        """Stamp file stored inside a document directory."""
+        return cls(Path(directory) / cls.FILENAME)
+
+    def _key(self, target: BuildTarget) -> str:
+        return os.path.relpath(target.output_path.resolve(), self.path.parent.resolve())
+
+    def is_current(self, target: BuildTarget, digest: str) -> bool:
+        """Whether target was last built from exactly these inputs and its output still exists."""
+        return self.digests.get(self._key(target)) == digest and target.output_path.exists()
+
+    def update(self, target: BuildTarget, digest: str):
+        """Record a successful build."""
+        self.digests[self._key(target)] = digest
+
+    def save(self):
+        """Atomically write the stamp file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"version": self.VERSION, "targets": self.digests}, indent=2, sort_keys=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def _run_target(func: Callable, args: tuple, kwargs: dict) -> float:
+    """Worker task: build one target and return its wall time."""
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def build_targets(
+    targets: list[BuildTarget],
+    workers: Optional[int] = None,
+    stamp: Optional[BuildStamp] = None,
+    force: bool = False,
+) -> dict[str, float]:
+    """
+    Build every out-of-date target, in parallel worker processes.
+
+    A failing target is reported and does not stop the others.
+
+    Args:
+        targets: Documents to build.
+        workers: Worker processes (default: one per target, capped at CPU
+                 count). 1 builds in this process, one after another.
+        stamp: Build stamp for incremental builds (targets may carry their
+               own). Targets without one are always rebuilt.
+        force: Rebuild even up-to-date targets (the stamp is still updated).
+
+    Returns:
+        Mapping of target name to wall time in seconds, for the targets
+        that were built successfully.
+    """
+    stamps = {target.name: target.stamp or stamp for target in targets}
+    digests = {}
+    pending = []
+    for target in targets:
+        target_stamp = stamps[target.name]
+        if target_stamp is not None:
+            digests[target.name] = digest = target.digest()
+            if not force and target_stamp.is_current(target, digest):
+                print(f"⏭️  Up to date: {target.name}")
+                continue
+        pending.append(target)
+    targets = pending
+
+    if not targets:
+        print("Nothing to build.")
+        return {}
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(targets)))
+    print(f"📄 Building {len(targets)} document(s) with {workers} worker(s)")
+
+    timings: dict[str, float] = {}
+    failed: list[str] = []
+    start = time.time()
+
+    def record(target: BuildTarget, run: Callable[[], float]):
+        try:
+            elapsed = run()
+        except Exception as e:
+            failed.append(target.name)
+            print(f"⚠️  Failed {target.name}: {e}")
+            return
+        timings[target.name] = elapsed
+        if stamps[target.name] is not None:
+            stamps[target.name].update(target, digests[target.name])
+        print(f"✅ Built: {target.name} ({elapsed:.2f}s)")
+
+    if workers == 1:
+        for target in targets:
+            record(target, lambda: _run_target(target.func, target.args, target.kwargs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_target, t.func, t.args, t.kwargs): t
+                for t in targets
+            }
+            for future in as_completed(futures):
+                record(futures[future], future.result)
+
+    for target_stamp in {stamps[name] for name in timings} - {None}:
+        target_stamp.save()
+
+    total = time.time() - start
+    print(f"\n{'═' * 60}")
+    print(f"BUILD: {len(timings)}/{len(targets)} documents in {total:.2f}s")
+    print(f"{'═' * 60}")
+    width = max([40, *map(len, timings), *map(len, failed)])
+    for name, elapsed in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"   {name:<{width}} {elapsed:7.2f}s")
+    if timings:
+        print(f"   {'(sequential total)':<{width}} {sum(timings.values()):7.2f}s")
+    for name in failed:
+        print(f"   {name:<{width}}  failed")
+
+    return timings
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Gemini Image Backend
+====================
+The one place that talks to Gemini for image generation: client setup,
+request config, rate limiting/retries and pulling the image bytes out of
+the response.
+
+ImageGenerator and every generate_* script go through a GeminiBackend, so
+fixes to connection handling, retries or response parsing apply to all
+of them at once. ImageGenerator accepts any object with the same
+``model`` / ``get_client()`` / ``generate()`` / ``agenerate()``
+interface, which is how an alternative backend is plugged in.
+
+Usage:
+    from lib.gemini_backend import GeminiBackend
+
+    backend = GeminiBackend()
+    png_bytes = backend.generate("A circuit board pattern", aspect_ratio="16:9", size="2K")
+
+    # Older models without image_config: leave aspect_ratio/size unset
+    flash = GeminiBackend(model="gemini-2.0-flash-exp-image-generation")
+    flash.save(flash.generate(prompt), "logo.png")
+
+    # Async
+    png_bytes = await backend.agenerate(prompt, aspect_ratio="1:1")
+
+Clients are pooled per API key (see get_genai_client), so every backend,
+ImageGenerator and generate_image() call in a process reuses the same
+keep-alive connections instead of paying a new TLS handshake.
+"""
+
+import asyncio
+import base64
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+try:
+    from .rate_limit import RetryPolicy, TokenBucket, acall_with_retry, call_with_retry, get_rate_limiter
+except ImportError:  # running this file directly as a script
+    from rate_limit import RetryPolicy, TokenBucket, acall_with_retry, call_with_retry, get_rate_limiter
+
+
+# .env in the shared directory, loaded on first backend rather than at import
+_ENV_PATH = Path(__file__).parent.parent / ".env"
+_env_loaded = False
+
+
+def load_env():
+    """Load shared/.env into os.environ (once per process)."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(_ENV_PATH)
+
+
+def image_bytes_from_part(part) -> Optional[bytes]:
+    """
+    Return the encoded image bytes carried by a Gemini response part.
+
+    Reads ``part.inline_data.data`` directly (base64-decoding it if the SDK
+    hands back a string) and only falls back to ``part.as_image()`` for SDK
+    versions without inline data. Returns None for non-image parts.
+    """
+    inline = getattr(part, "inline_data", None)
+    if inline is not None and inline.data:
+        data = inline.data
+        if isinstance(data, str):
+            data = base64.b64decode(data)
+        return data
+
+    as_image = getattr(part, "as_image", None)
+    image = as_image() if as_image else None
+    if image is None:
+        return None
+    if getattr(image, "image_bytes", None):
+        return image.image_bytes
+    # PIL image: encode into memory rather than through a temp file
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# Connection pool sizing for the shared httpx clients
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 120.0
+
+_clients: dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _http_options(types):
+    """
+    HttpOptions giving the SDK's httpx clients keep-alive pools and HTTP/2.
+
+    HTTP/2 is only requested when the ``h2`` package is installed. Returns
+    None on SDK versions whose HttpOptions has no client_args.
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+    try:
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    def client_args():
+        return {
+            "http2": http2,
+            "limits": httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        }
+
+    try:
+        return types.HttpOptions(client_args=client_args(), async_client_args=client_args())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _import_genai():
+    """Import google-genai, or exit with install instructions."""
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError:
+        print("❌ google-genai package not installed.")
+        print("   Install with: pip install google-genai")
+        sys.exit(1)
+    return genai, types
+
+
+def get_genai_client(api_key: str):
+    """
+    Return the process-wide genai.Client for an API key.
+
+    The client (and its connection pool) is created once per key and
+    shared by every caller; it is safe to use from multiple threads and
+    from the event loop via ``client.aio``.
+
+    Args:
+        api_key: Google API key.
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            genai, types = _import_genai()
+            http_options = _http_options(types)
+            if http_options is not None:
+                client = genai.Client(api_key=api_key, http_options=http_options)
+            else:
+                client = genai.Client(api_key=api_key)
+            _clients[api_key] = client
+    return client
+
+
+def close_genai_clients():
+    """Drop every pooled client so its connections can be closed."""
+    with _clients_lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if close is not None:
+                close()
+        _clients.clear()
+
+
+class GeminiBackend:
+    """
+    Gemini image generation: prompt in, encoded image bytes out.
+
+    Attributes:
+        MODEL: Default Gemini image model.
+        model: Model used when generate() is not given one.
+        rate_limiter: Token bucket every request draws from.
+        retry_policy: Backoff for 429/5xx responses.
+    """
+
+    MODEL = "gemini-3-pro-image-preview"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        verbose: bool = True,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Initialize the backend. The client itself is created on first use.
+
+        Args:
+            api_key: Google API key. If not provided, uses GOOGLE_API_KEY env var.
+            model: Default model name. Defaults to MODEL.
+            verbose: Whether to print model notes and progress.
+            rate_limiter: Token bucket for Gemini calls. Defaults to the
+                          process-wide limiter (GEMINI_RPM).
+            retry_policy: Backoff for 429/5xx responses. Defaults to RetryPolicy().
+            log: Callable used for messages (defaults to print when verbose).
+
+        Raises:
+            ValueError: If no API key is available.
+        """
+        load_env()
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.model = model or self.MODEL
+        self.verbose = verbose
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._log_fn = log
+        self._client = None
+        self._types = None
+
+        if not self.api_key:
+            raise ValueError(
+                "GOOGLE_API_KEY not found. "
+                f"Set it in {_ENV_PATH} or pass api_key parameter."
+            )
+
+    def __repr__(self) -> str:
+        return f"GeminiBackend(model={self.model!r})"
+
+    def _log(self, msg: str):
+        """Print if verbose mode is on."""
+        if self._log_fn is not None:
+            self._log_fn(msg)
+        elif self.verbose:
+            print(msg)
+
+    def get_client(self):
+        """Return the pooled Google GenAI client for this backend's API key."""
+        if self._client is None:
+            _, self._types = _import_genai()
+            self._client = get_genai_client(self.api_key)
+            self._log("✅ Google GenAI client initialized")
+
+        return self._client
+
+    def request_config(self, aspect_ratio: Optional[str] = None, size: Optional[str] = None):
+        """
+        Build the GenerateContentConfig for an image request.
+
+        ``image_config`` is only sent when an aspect ratio or size is given,
+        since older image models reject it.
+        """
+        self.get_client()
+        types = self._types
+        if aspect_ratio is None and size is None:
+            return types.GenerateContentConfig(response_modalities=['TEXT', 'IMAGE'])
+        return types.GenerateContentConfig(
+            response_modalities=['TEXT', 'IMAGE'],
+            image_config=types.ImageConfig(
+                aspect_ratio=aspect_ratio,
+                image_size=size,
+            ),
+        )
+
+    def extract_image(self, response) -> bytes:
+        """
+        Pull the image bytes out of a Gemini response.
+
+        The encoded bytes are taken straight from the response; nothing is
+        decoded or written to disk here.
+
+        Raises:
+            ValueError: If the response carries no image.
+        """
+        image_data = None
+        for part in response.parts or []:
+            if part.text is not None:
+                self._log(f"   💬 Model note: {part.text[:100]}...")
+            elif (data := image_bytes_from_part(part)) is not None:
+                image_data = data
+                self._log(f"   📦 Got image: {len(image_data)} bytes")
+
+        if not image_data:
+            raise ValueError("No image in response from Gemini")
+        return image_data
+
+    def _request(self, prompt: str, model: Optional[str], aspect_ratio: Optional[str], size: Optional[str]) -> dict:
+        """Keyword arguments for generate_content plus the retry settings."""
+        return dict(
+            model=model or self.model,
+            contents=[prompt],
+            config=self.request_config(aspect_ratio, size),
+            limiter=self.rate_limiter,
+            policy=self.retry_policy,
+            log=self._log,
+        )
+
+    def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        aspect_ratio: Optional[str] = None,
+        size: Optional[str] = None,
+    ) -> bytes:
+        """
+        Generate one image.
+
+        Args:
+            prompt: The final prompt sent to Gemini.
+            model: Model override for this call.
+            aspect_ratio: e.g. "16:9". Omit for models without image_config.
+            size: "1K", "2K", ... Omit for models without image_config.
+
+        Returns:
+            The encoded image bytes exactly as returned by Gemini.
+
+        Raises:
+            ValueError: If no image is returned.
+        """
+        client = self.get_client()
+        response = call_with_retry(
+            client.models.generate_content,
+            **self._request(prompt, model, aspect_ratio, size),
+        )
+        return self.extract_image(response)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        aspect_ratio: Optional[str] = None,
+        size: Optional[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> bytes:
+        """
+        Async counterpart of generate() using the SDK's native ``client.aio``.
+
+        Args:
+            prompt, model, aspect_ratio, size: Same as generate().
+            semaphore: Optional semaphore bounding concurrent requests.
+        """
+        client = self.get_client()
+        request = self._request(prompt, model, aspect_ratio, size)
+        if semaphore is not None:
+            async with semaphore:
+                response = await acall_with_retry(client.aio.models.generate_content, **request)
+        else:
+            response = await acall_with_retry(client.aio.models.generate_content, **request)
+        return self.extract_image(response)
+
+    def save(self, image_data: bytes, output_path: Union[str, Path]) -> Path:
+        """Write image bytes to output_path, creating parent directories."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(image_data)
+        return output_path
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+HTML → PDF Render Service
+=========================
+A warm headless Chromium with a pool of pages that renders many HTML
+files to PDF, so a multi-deck export pays the browser startup once.
+
+Instead of sleeping a fixed time after navigation, each job waits for
+deterministic readiness signals: network idle, ``document.fonts.ready``,
+every <img> loaded, and all CSS animations/transitions finished (or
+paused, when infinite). Pages are rendered concurrently, one job per
+pooled page.
+
+Usage:
+    from lib.html_pdf import PdfRenderService
+
+    with PdfRenderService(pages=4) as service:
+        service.render("deck.html", "deck.pdf", format="Letter", landscape=True)
+
+        # Many jobs at once; returns {pdf_path: seconds or exception}
+        results = service.render_many([
+            ("q1.html", "q1.pdf"),
+            ("q2.html", "q2.pdf"),
+        ], format="Letter")
+
+The service runs Playwright's async API on its own event-loop thread, so
+it can be driven from plain synchronous scripts; submit() returns a
+concurrent.futures.Future.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Union
+
+# Resolves once fonts, images and animations have settled
+_READY_JS = """
+async () => {
+    await document.fonts.ready;
+    await Promise.all(Array.from(document.images, img => img.complete ? null :
+        new Promise(resolve => { img.onload = img.onerror = resolve; })));
+    for (const animation of document.getAnimations()) {
+        try { animation.finish(); } catch (e) { animation.pause(); }
+    }
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+}
+"""
+
+Source = Union[str, Path]
+
+
+def _to_url(source: Source) -> str:
+    """URLs pass through; file paths become file:// URLs."""
+    if isinstance(source, str) and "://" in source:
+        return source
+    return Path(source).resolve().as_uri()
+
+
+class PdfRenderService:
+    """
+    A long-lived browser that turns HTML pages into PDFs.
+
+    The browser is launched on first use (or by start()) and kept until
+    close(). Each pooled page renders one job at a time; a page that
+    fails a job is replaced.
+
+    Attributes:
+        pages: Number of pooled pages (concurrent renders).
+        timeout: Per-job navigation/readiness timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        pages: int = 4,
+        timeout: float = 30.0,
+        launch_options: Optional[dict] = None,
+        verbose: bool = True,
+    ):
+        """
+        Configure the service. Nothing is launched until start().
+
+        Args:
+            pages: Pooled pages, i.e. how many documents render at once.
+            timeout: Seconds a job may spend loading and settling.
+            launch_options: Extra keyword arguments for chromium.launch().
+            verbose: Whether to print when the browser starts and stops.
+        """
+        self.pages = max(1, pages)
+        self.timeout = timeout
+        self.launch_options = launch_options or {}
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browser = None
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._live_pages = 0
+
+    def __repr__(self) -> str:
+        state = "running" if self._browser is not None else "stopped"
+        return f"PdfRenderService(pages={self.pages}, {state})"
+
+    def __enter__(self) -> "PdfRenderService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """Launch the browser and open the page pool (no-op if running)."""
+        with self._lock:
+            if self._browser is not None:
+                return
+            try:
+                from playwright.async_api import async_playwright
+            except ImportError:
+                print("❌ playwright package not installed.")
+                print("   Install with: pip install playwright && playwright install chromium")
+                sys.exit(1)
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="pdf-render", daemon=True)
+            self._thread.start()
+            start = time.time()
+            try:
+                asyncio.run_coroutine_threadsafe(self._astart(async_playwright), self._loop).result()
+            except BaseException:
+                self._stop_loop()
+                raise
+            if self.verbose:
+                print(f"🌐 Chromium ready with {self.pages} page(s) ({time.time() - start:.2f}s)")
+
+    async def _astart(self, async_playwright):
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(**self.launch_options)
+        except BaseException:
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+        self._page_pool = asyncio.Queue()
+        for _ in range(self.pages):
+            self._page_pool.put_nowait(await self._browser.new_page())
+        self._live_pages = self.pages
+
+    def close(self):
+        """Close the browser and stop the event-loop thread."""
+        with self._lock:
+            if self._loop is None:
+                return
+            if self._browser is not None:
+                asyncio.run_coroutine_threadsafe(self._aclose(), self._loop).result()
+            self._stop_loop()
+            if self.verbose:
+                print("🌐 Chromium closed")
+
+    def _stop_loop(self):
+        """Stop and discard the event-loop thread. Lock held."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+
+    async def _aclose(self):
+        await self._browser.close()
+        await self._playwright.stop()
+        self._browser = self._playwright = self._page_pool = None
+        self._live_pages = 0
+
+    async def _replace_page(self, page):
+        """
+        Swap a page that failed a job for a fresh one.
+
+        Returns the new page, or None if none could be opened; the pool
+        then shrinks by one, and once it is empty every waiting job fails.
+        """
+        try:
+            await page.close()
+        except Exception:
+            pass
+        try:
+            return await self._browser.new_page()
+        except Exception as e:
+            self._live_pages -= 1
+            print(f"⚠️  Could not replace a browser page ({self._live_pages} left): {e}")
+            if self._live_pages == 0:
+                self._page_pool.put_nowait(None)  # wakes waiting jobs so they fail
+            return None
+
+    async def _arender(self, url: str, pdf_path: Path, pdf_options: dict) -> float:
+        page = await self._page_pool.get()
+        if page is None:
+            self._page_pool.put_nowait(None)
+            raise RuntimeError("No browser pages left; restart the PdfRenderService")
+        start = time.time()
+        try:
+            timeout_ms = self.timeout * 1000
+            await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
+            await asyncio.wait_for(page.evaluate(_READY_JS), self.timeout)
+            pdf_path.parent.mkdir(parents=True, exist_ok=True)
+            await page.pdf(path=str(pdf_path), **pdf_options)
+        except BaseException:
+            # Don't hand a half-loaded page to the next job
+            page = await self._replace_page(page)
+            raise
+        finally:
+            if page is not None:
+                self._page_pool.put_nowait(page)
+        return time.time() - start
+
+    def submit(self, source: Source, pdf_path: Union[str, Path], **pdf_options) -> Future:
+        """
+        Queue one HTML → PDF job.
+
+        Args:
+            source: HTML file path or URL.
+            pdf_path: Where to write the PDF.
+            pdf_options: Keyword arguments for Playwright's page.pdf()
+                         (format, landscape, margin, print_background, ...).
+
+        Returns:
+            Future resolving to the job's wall time in seconds.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(
+            self._arender(_to_url(source), Path(pdf_path), pdf_options),
+            self._loop,
+        )
+
+    def render(self, source: Source, pdf_path: Union[str, Path], **pdf_options) -> float:
+        """Render one document and wait for it. Returns the wall time."""
+        return self.submit(source, pdf_path, **pdf_options).result()
+
+    def render_many(
+        self,
+        jobs: list[tuple[Source, Union[str, Path]]],
+        **pdf_options,
+    ) -> dict[Path, Union[float, Exception]]:
+        """
+        Render many documents concurrently across the page pool.
+
+        Args:
+            jobs: (source, pdf_path) pairs.
+            pdf_options: page.pdf() options shared by every job.
+
+        Returns:
+            Mapping of pdf_path to wall time, or to the exception it raised.
+
+        Raises:
+            ValueError: If two jobs write the same pdf_path.
+        """
+        seen = {}
+        for src, pdf in jobs:
+            key = Path(pdf).resolve()
+            if key in seen:
+                raise ValueError(f"{src} and {seen[key]} would both be written to {pdf}")
+            seen[key] = src
+        futures = {Path(pdf): self.submit(src, pdf, **pdf_options) for src, pdf in jobs}
+        results: dict[Path, Union[float, Exception]] = {}
+        for pdf_path, future in futures.items():
+            try:
+                results[pdf_path] = future.result()
+            except Exception as e:
+                results[pdf_path] = e
+        return results
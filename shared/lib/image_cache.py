@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Image Cache
+=============================
+On-disk cache for generated images, keyed by a hash of the full request.
+
+Identical requests (same model, prompt, style suffix, aspect ratio, size,
+resize target and background removal) map to the same key, so re-running a
+batch only pays Gemini for prompts that actually changed. The cache is
+bounded in bytes; least recently used entries are evicted first.
+
+Usage:
+    from lib.image_cache import ImageCache
+
+    cache = ImageCache()                      # shared/.image_cache, 2 GB
+    key = ImageCache.make_key(model="...", prompt="A cat", size="2K")
+
+    data = cache.get(key)
+    if data is None:
+        data = expensive_generation()
+        cache.put(key, data)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+
+class ImageCache:
+    """
+    Size-bounded LRU cache of image bytes stored under content-addressed keys.
+
+    Entries live at ``<cache_dir>/<key[:2]>/<key><suffix>``, where the
+    suffix matches the stored bytes (.png, .jpg, .webp, ...), so files on
+    disk are labeled with their real format. Reading an entry bumps its
+    mtime, which is what eviction orders by.
+
+    Attributes:
+        DEFAULT_DIR: Default cache location (``shared/.image_cache``).
+        DEFAULT_MAX_BYTES: Default size bound for the whole cache.
+    """
+
+    DEFAULT_DIR = Path(__file__).parent.parent / ".image_cache"
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+    # Leading magic bytes -> file suffix; anything unrecognized is stored as .bin
+    SIGNATURES = (
+        (b"\x89PNG\r\n\x1a\n", ".png"),
+        (b"\xff\xd8\xff", ".jpg"),
+        (b"GIF8", ".gif"),
+    )
+    FALLBACK_SUFFIX = ".bin"
+    SUFFIXES = (".png", ".jpg", ".webp", ".gif", FALLBACK_SUFFIX)
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache entries. Defaults to DEFAULT_DIR.
+            max_bytes: Evict least recently used entries above this total size.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else self.DEFAULT_DIR
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # computed lazily on first put
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """
+        Build a cache key from a request description.
+
+        The request is serialized as canonical JSON (sorted keys, tuples as
+        lists) before hashing, so keyword order does not matter.
+
+        Returns:
+            Hex SHA-256 digest of the normalized request.
+        """
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def suffix_for(cls, data: bytes) -> str:
+        """File suffix for image bytes, detected from their magic number."""
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            return ".webp"
+        for signature, suffix in cls.SIGNATURES:
+            if data.startswith(signature):
+                return suffix
+        return cls.FALLBACK_SUFFIX
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def _find(self, key: str) -> list[Path]:
+        """Existing entry files for key (normally at most one)."""
+        paths = (self._path(key, suffix) for suffix in self.SUFFIXES)
+        return [path for path in paths if path.exists()]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None on a miss."""
+        for suffix in self.SUFFIXES:
+            path = self._path(key, suffix)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            break
+        else:
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> Path:
+        """
+        Store bytes under key and evict old entries if over the size bound.
+
+        The write is atomic, so concurrent readers never see a partial file.
+
+        Returns:
+            Path of the cache entry.
+        """
+        path = self._path(key, self.suffix_for(data))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            previous = 0
+            for old in self._find(key):
+                try:
+                    previous += old.stat().st_size
+                    if old != path:
+                        old.unlink()  # same key stored earlier in another format
+                except FileNotFoundError:
+                    continue
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+        return path
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*/*"):
+            if path.suffix not in self.SUFFIXES:
+                continue  # e.g. an in-progress .tmp write
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(st.st_size for _, st in self._entries())
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes. Lock held."""
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime)
+        total = sum(st.st_size for _, st in entries)
+        for path, st in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= st.st_size
+            except FileNotFoundError:
+                continue
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every cache entry."""
+        with self._lock:
+            for path, _ in self._entries():
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def size_bytes(self) -> int:
+        """Current total size of the cache on disk."""
+        return self._scan_size()
@@ -26,6 +26,9 @@ Usage:
         target_size=(1920, 1080)
     )
     
+    # Identical requests are served from the on-disk cache (shared/.image_cache)
+    gen = ImageGenerator(cache=False)   # opt out, e.g. to re-roll a prompt
+    
     # Generate with background removal
     gen.generate(
         prompt="A robot character",
@@ -33,25 +36,47 @@ Usage:
         remove_bg=True
     )
     
+    # Extra post-processing stages share one decode/encode with the above
+    gen.generate(
+        prompt="A robot character",
+        output_path="robot.webp",
+        target_size=(1024, 1024),
+        remove_bg=True,
+        pipeline=ImagePipeline().crop((0, 0, 1024, 768)).to_format("WEBP"),
+    )
+    
     # Remove background from existing image
     result = remove_background("input.png", "output.png")
     
     # Or from bytes
     output_bytes = remove_background(input_bytes)
+    
+    # Async: drive many prompts from one event loop
+    results = asyncio.run(gen.agenerate_batch(prompts, "output/", max_concurrency=32))
 """
 
-import os
+import asyncio
 import sys
 import io
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Tuple, Union, Literal
 
-# Load .env from shared directory
-from dotenv import load_dotenv
-
-_ENV_PATH = Path(__file__).parent.parent / ".env"
-load_dotenv(_ENV_PATH)
+try:
+    from .background import DEFAULT_REMBG_MODEL, BackgroundRemover, get_background_remover
+    from .gemini_backend import _ENV_PATH, GeminiBackend
+    from .image_cache import ImageCache
+    from .image_pipeline import ImagePipeline
+    from .manifest import JobManifest
+    from .rate_limit import RetryPolicy, TokenBucket
+except ImportError:  # running this file directly as a script
+    from background import DEFAULT_REMBG_MODEL, BackgroundRemover, get_background_remover
+    from gemini_backend import _ENV_PATH, GeminiBackend
+    from image_cache import ImageCache
+    from image_pipeline import ImagePipeline
+    from manifest import JobManifest
+    from rate_limit import RetryPolicy, TokenBucket
 
 
 # Type aliases
@@ -65,9 +90,10 @@ class ImageGenerator:
     
     Attributes:
         MODEL: The Gemini model to use for image generation.
+        backend: The GeminiBackend (or compatible object) that makes the calls.
     """
     
-    MODEL = "gemini-3-pro-image-preview"
+    MODEL = GeminiBackend.MODEL
     
     ASPECT_RATIOS: dict[str, AspectRatio] = {
         "square": "1:1",
@@ -78,75 +104,64 @@ class ImageGenerator:
         "wide": "21:9",
     }
     
-    def __init__(self, api_key: Optional[str] = None, verbose: bool = True):
+    # Concurrent Gemini requests in generate_batch (each one is I/O bound)
+    DEFAULT_MAX_WORKERS = 4
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        verbose: bool = True,
+        cache: Union[bool, ImageCache] = True,
+        rembg_model: str = DEFAULT_REMBG_MODEL,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        backend: Optional[GeminiBackend] = None,
+    ):
         """
         Initialize the image generator.
         
         Args:
             api_key: Google API key. If not provided, uses GOOGLE_API_KEY env var.
             verbose: Whether to print progress messages.
+            cache: True for the default on-disk ImageCache, False to disable
+                   caching, or a custom ImageCache instance.
+            rembg_model: rembg model used when remove_bg=True. The model
+                         session is shared process-wide and loaded once.
+            rate_limiter: Token bucket for Gemini calls. Defaults to the
+                          process-wide limiter (GEMINI_RPM).
+            retry_policy: Backoff for 429/5xx responses. Defaults to RetryPolicy().
+            backend: Object that performs the Gemini calls (anything with
+                     ``model``, ``get_client()``, ``generate()`` and ``agenerate()``). Defaults
+                     to a GeminiBackend built from the arguments above.
+        
+        Raises:
+            ValueError: If no API key is available.
         """
-        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         self.verbose = verbose
-        self._client = None
-        self._genai = None
-        self._types = None
-        self._pil = None
-        self._rembg = None
-        
-        if not self.api_key:
-            raise ValueError(
-                "GOOGLE_API_KEY not found. "
-                f"Set it in {_ENV_PATH} or pass api_key parameter."
-            )
+        if cache is True:
+            self.cache: Optional[ImageCache] = ImageCache()
+        else:
+            self.cache = cache or None
+        self.rembg_model = rembg_model
+        self.backend = backend or GeminiBackend(
+            api_key=api_key,
+            model=self.MODEL,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            log=self._log,
+        )
+        
+        # Per-item wall time (seconds) of the most recent generate_batch call
+        self.last_batch_timings: dict[str, float] = {}
     
     def _log(self, msg: str):
         """Print if verbose mode is on."""
         if self.verbose:
             print(msg)
     
-    def _get_client(self):
-        """Lazy-load the Google GenAI client."""
-        if self._client is None:
-            try:
-                from google import genai
-                from google.genai import types
-                self._genai = genai
-                self._types = types
-            except ImportError:
-                print("❌ google-genai package not installed.")
-                print("   Install with: pip install google-genai")
-                sys.exit(1)
-            
-            self._client = genai.Client(api_key=self.api_key)
-            self._log("✅ Google GenAI client initialized")
-        
-        return self._client
-    
-    def _get_pil(self):
-        """Lazy-load PIL."""
-        if self._pil is None:
-            try:
-                from PIL import Image
-                self._pil = Image
-            except ImportError:
-                print("❌ Pillow not installed.")
-                print("   Install with: pip install Pillow")
-                sys.exit(1)
-        return self._pil
-    
-    def _get_rembg(self):
-        """Lazy-load rembg."""
-        if self._rembg is None:
-            try:
-                from rembg import remove
-                self._rembg = remove
-                self._log("✅ rembg loaded (first use may download model)")
-            except ImportError:
-                print("❌ rembg not installed.")
-                print("   Install with: pip install rembg")
-                sys.exit(1)
-        return self._rembg
+    def _get_rembg(self) -> BackgroundRemover:
+        """Get the shared rembg session for this generator's model (loaded lazily)."""
+        return get_background_remover(self.rembg_model, verbose=self.verbose)
     
     def _determine_aspect_ratio(self, target_size: Tuple[int, int]) -> AspectRatio:
         """Determine best aspect ratio for target dimensions."""
@@ -166,6 +181,173 @@ class ImageGenerator:
         else:
             return "9:16"
     
+    def _cache_key(
+        self,
+        final_prompt: str,
+        aspect_ratio: AspectRatio,
+        size: ImageSize,
+        target_size: Optional[Tuple[int, int]],
+        remove_bg: bool,
+        pipeline: Optional[ImagePipeline] = None,
+    ) -> str:
+        """Hash everything that determines the output image."""
+        extra = {}
+        if remove_bg:
+            extra["rembg_model"] = self.rembg_model
+        if pipeline is not None:
+            extra["pipeline"] = pipeline.describe() + [pipeline.output_format, pipeline.save_options]
+        return ImageCache.make_key(
+            model=self.backend.model,
+            prompt=final_prompt,
+            aspect_ratio=aspect_ratio,
+            size=size,
+            target_size=list(target_size) if target_size else None,
+            remove_bg=remove_bg,
+            **extra,
+        )
+    
+    def _save(self, image_data: bytes, output_path: Union[str, Path]):
+        """Write image bytes to output_path, creating parent directories."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(image_data)
+        self._log(f"   💾 Saved: {output_path}")
+    
+    def _resolve(
+        self,
+        prompt: str,
+        aspect_ratio: Optional[AspectRatio],
+        target_size: Optional[Tuple[int, int]],
+        style_suffix: Optional[str],
+    ) -> Tuple[str, AspectRatio]:
+        """Build the final prompt and pick the aspect ratio actually sent to Gemini."""
+        # Build final prompt
+        final_prompt = prompt
+        if style_suffix:
+            final_prompt += f"\n\n{style_suffix}"
+        
+        # Determine aspect ratio
+        if target_size and not aspect_ratio:
+            aspect_ratio = self._determine_aspect_ratio(target_size)
+        return final_prompt, aspect_ratio or "1:1"
+    
+    def _request_hash(
+        self,
+        prompt: str,
+        aspect_ratio: Optional[AspectRatio] = None,
+        size: ImageSize = "2K",
+        target_size: Optional[Tuple[int, int]] = None,
+        style_suffix: Optional[str] = None,
+        remove_bg: bool = False,
+        pipeline: Optional[ImagePipeline] = None,
+    ) -> str:
+        """Hash of a generate() request, as used for cache keys and job manifests."""
+        final_prompt, aspect_ratio = self._resolve(prompt, aspect_ratio, target_size, style_suffix)
+        return self._cache_key(final_prompt, aspect_ratio, size, target_size, remove_bg, pipeline)
+    
+    def _prepare(
+        self,
+        prompt: str,
+        aspect_ratio: Optional[AspectRatio],
+        size: ImageSize,
+        target_size: Optional[Tuple[int, int]],
+        style_suffix: Optional[str],
+        remove_bg: bool,
+        pipeline: Optional[ImagePipeline] = None,
+    ) -> Tuple[str, AspectRatio, Optional[ImagePipeline], Optional[str]]:
+        """
+        Resolve prompt, aspect ratio and post-processing, and log the request.
+        
+        Returns:
+            (final_prompt, aspect_ratio, post_pipeline, cache_key);
+            post_pipeline is None when no post-processing is needed and
+            cache_key is None when caching is disabled.
+        """
+        final_prompt, aspect_ratio = self._resolve(prompt, aspect_ratio, target_size, style_suffix)
+        
+        self._log("🎨 Generating image...")
+        self._log(f"   📝 Prompt: {prompt[:80]}{'...' if len(prompt) > 80 else ''}")
+        self._log(f"   📐 Aspect ratio: {aspect_ratio}")
+        self._log(f"   📏 Size: {size}")
+        if target_size:
+            self._log(f"   🎯 Target resize: {target_size[0]}x{target_size[1]}")
+        if remove_bg:
+            self._log("   🔲 Background removal: enabled")
+        if pipeline:
+            self._log(f"   🧩 Extra stages: {', '.join(pipeline.describe())} → {pipeline.output_format}")
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(final_prompt, aspect_ratio, size, target_size, remove_bg, pipeline)
+        
+        post = self._build_pipeline(target_size, remove_bg, pipeline)
+        return final_prompt, aspect_ratio, post, cache_key
+    
+    def _cached(self, cache_key: Optional[str], output_path: Optional[Union[str, Path]]) -> Optional[bytes]:
+        """Return cached image bytes (saving them to output_path), or None."""
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self._log(f"   ♻️  Cache hit: {cache_key[:12]} ({len(cached)} bytes)")
+            if output_path:
+                self._save(cached, output_path)
+            self._log("✅ Done!")
+        return cached
+    
+    def _build_pipeline(
+        self,
+        target_size: Optional[Tuple[int, int]],
+        remove_bg: bool,
+        extra: Optional[ImagePipeline] = None,
+    ) -> Optional[ImagePipeline]:
+        """
+        Combine resize, background removal and any extra stages.
+        
+        Returns None when there is nothing to do, so the Gemini bytes are
+        passed through without being decoded.
+        """
+        if not target_size and not remove_bg and extra is None:
+            return None
+        
+        pipeline = ImagePipeline()
+        if target_size:
+            pipeline.resize(target_size)
+        if remove_bg:
+            # The shared session is only loaded once the stage actually runs
+            pipeline.remove_background(self._get_rembg(), name=f"remove_bg({self.rembg_model})")
+        if extra is not None:
+            pipeline.extend(extra)
+        return pipeline
+    
+    def _postprocess(self, image_data: bytes, pipeline: Optional[ImagePipeline]) -> bytes:
+        """Run the post-processing pipeline: one decode, all stages, one encode."""
+        if pipeline is None:
+            return image_data
+        
+        start = time.time()
+        self._log(f"   🧩 Post-processing: {' → '.join(pipeline.describe())}")
+        image_data = pipeline.process(image_data)
+        self._log(f"   ✅ Post-processed in {time.time() - start:.1f}s: {len(image_data)} bytes")
+        return image_data
+    
+    def _finish(
+        self,
+        image_data: bytes,
+        cache_key: Optional[str],
+        output_path: Optional[Union[str, Path]],
+    ) -> bytes:
+        """Store a freshly generated image in the cache and on disk."""
+        if cache_key is not None:
+            self.cache.put(cache_key, image_data)
+        
+        # Save to file if path provided
+        if output_path:
+            self._save(image_data, output_path)
+        
+        self._log("✅ Done!")
+        return image_data
+    
     def generate(
         self,
         prompt: str,
@@ -175,10 +357,14 @@ class ImageGenerator:
         target_size: Optional[Tuple[int, int]] = None,
         style_suffix: Optional[str] = None,
         remove_bg: bool = False,
+        pipeline: Optional[ImagePipeline] = None,
     ) -> bytes:
         """
         Generate an image from a prompt.
         
+        If caching is enabled and an identical request was made before, the
+        cached image is returned without calling Gemini.
+        
         Args:
             prompt: The image generation prompt.
             output_path: Optional path to save the image.
@@ -188,138 +374,219 @@ class ImageGenerator:
             target_size: Optional (width, height) to resize the output.
             style_suffix: Optional text to append to prompt (e.g., style guidelines).
             remove_bg: Whether to remove the background (uses rembg).
+            pipeline: Optional extra ImagePipeline stages (crop, format
+                      conversion, ...) run after resize/background removal.
+                      All post-processing shares a single decode and encode.
         
         Returns:
-            The image as PNG bytes.
+            The image as PNG bytes (or the pipeline's output format).
         
         Raises:
             ValueError: If generation fails or no image is returned.
+        
+        Gemini calls are rate limited and retried with jittered exponential
+        backoff on 429/5xx (honouring Retry-After).
         """
-        client = self._get_client()
-        types = self._types
+        final_prompt, aspect_ratio, post, cache_key = self._prepare(
+            prompt, aspect_ratio, size, target_size, style_suffix, remove_bg, pipeline
+        )
+        cached = self._cached(cache_key, output_path)
+        if cached is not None:
+            return cached
         
-        # Build final prompt
-        final_prompt = prompt
-        if style_suffix:
-            final_prompt += f"\n\n{style_suffix}"
+        start = time.time()
         
-        # Determine aspect ratio
-        if target_size and not aspect_ratio:
-            aspect_ratio = self._determine_aspect_ratio(target_size)
-        aspect_ratio = aspect_ratio or "1:1"
+        try:
+            image_data = self.backend.generate(final_prompt, aspect_ratio=aspect_ratio, size=size)
+            
+            elapsed = time.time() - start
+            self._log(f"   ⏱️  Generated in {elapsed:.1f}s")
+            
+            image_data = self._postprocess(image_data, post)
+            return self._finish(image_data, cache_key, output_path)
+            
+        except Exception as e:
+            self._log(f"❌ Error: {e}")
+            raise
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        output_path: Optional[Union[str, Path]] = None,
+        aspect_ratio: Optional[AspectRatio] = None,
+        size: ImageSize = "2K",
+        target_size: Optional[Tuple[int, int]] = None,
+        style_suffix: Optional[str] = None,
+        remove_bg: bool = False,
+        pipeline: Optional[ImagePipeline] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> bytes:
+        """
+        Async counterpart of generate().
         
-        self._log(f"🎨 Generating image...")
-        self._log(f"   📝 Prompt: {prompt[:80]}{'...' if len(prompt) > 80 else ''}")
-        self._log(f"   📐 Aspect ratio: {aspect_ratio}")
-        self._log(f"   📏 Size: {size}")
-        if target_size:
-            self._log(f"   🎯 Target resize: {target_size[0]}x{target_size[1]}")
-        if remove_bg:
-            self._log(f"   🔲 Background removal: enabled")
+        The Gemini call goes through the SDK's native async client
+        (``client.aio``); resize, background removal and file writes run in
+        a worker thread so they never block the event loop. Cancelling the
+        awaiting task aborts the in-flight request.
+        
+        Args:
+            prompt, output_path, aspect_ratio, size, target_size,
+            style_suffix, remove_bg, pipeline: Same as generate().
+            semaphore: Optional semaphore bounding concurrent Gemini calls.
+        
+        Returns:
+            The image as PNG bytes.
+        
+        Example:
+            png = await gen.agenerate("A lighthouse at dusk", "lighthouse.png")
+        """
+        final_prompt, aspect_ratio, post, cache_key = self._prepare(
+            prompt, aspect_ratio, size, target_size, style_suffix, remove_bg, pipeline
+        )
+        cached = await asyncio.to_thread(self._cached, cache_key, output_path)
+        if cached is not None:
+            return cached
         
         start = time.time()
         
         try:
-            response = client.models.generate_content(
-                model=self.MODEL,
-                contents=[final_prompt],
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio=aspect_ratio,
-                        image_size=size,
-                    ),
-                ),
+            image_data = await self.backend.agenerate(
+                final_prompt, aspect_ratio=aspect_ratio, size=size, semaphore=semaphore
             )
             
             elapsed = time.time() - start
             self._log(f"   ⏱️  Generated in {elapsed:.1f}s")
             
-            # Extract image data
-            image_data = None
-            for part in response.parts:
-                if part.text is not None:
-                    self._log(f"   💬 Model note: {part.text[:100]}...")
-                elif image := part.as_image():
-                    # Save to temp file and read bytes (Gemini SDK API)
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                        tmp_path = tmp.name
-                    image.save(tmp_path)
-                    with open(tmp_path, 'rb') as f:
-                        image_data = f.read()
-                    os.unlink(tmp_path)
-                    self._log(f"   📦 Got image: {len(image_data)} bytes")
-            
-            if not image_data:
-                raise ValueError("No image in response from Gemini")
-            
-            # Resize if target_size specified
-            if target_size:
-                Image = self._get_pil()
-                img = Image.open(io.BytesIO(image_data))
-                self._log(f"   📏 Original size: {img.size}")
-                
-                # Convert to RGBA for transparency support
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                # Resize with high-quality resampling
-                img_resized = img.resize(target_size, Image.Resampling.LANCZOS)
-                self._log(f"   ✂️  Resized to: {img_resized.size}")
-                
-                # Save to bytes
-                output = io.BytesIO()
-                img_resized.save(output, format='PNG')
-                image_data = output.getvalue()
-            
-            # Remove background if requested
-            if remove_bg:
-                self._log("   🔲 Removing background...")
-                rembg_remove = self._get_rembg()
-                Image = self._get_pil()
-                
-                img = Image.open(io.BytesIO(image_data))
-                img_nobg = rembg_remove(img)
-                
-                output = io.BytesIO()
-                img_nobg.save(output, format='PNG')
-                image_data = output.getvalue()
-                self._log(f"   ✅ Background removed: {len(image_data)} bytes")
-            
-            # Save to file if path provided
-            if output_path:
-                output_path = Path(output_path)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_bytes(image_data)
-                self._log(f"   💾 Saved: {output_path}")
-            
-            self._log("✅ Done!")
-            return image_data
+            image_data = await asyncio.to_thread(self._postprocess, image_data, post)
+            return await asyncio.to_thread(self._finish, image_data, cache_key, output_path)
             
+        except asyncio.CancelledError:
+            self._log("   🛑 Cancelled")
+            raise
         except Exception as e:
             self._log(f"❌ Error: {e}")
             raise
     
+    def _batch_item_kwargs(
+        self,
+        config: Union[dict, str],
+        default_aspect: AspectRatio,
+        default_size: ImageSize,
+    ) -> dict:
+        """Turn one generate_batch prompt config into generate() kwargs."""
+        if not isinstance(config, dict):
+            config = {"prompt": config}
+        
+        aspect = config.get("aspect", default_aspect)
+        # Map named aspects to actual ratios
+        if aspect in self.ASPECT_RATIOS:
+            aspect = self.ASPECT_RATIOS[aspect]
+        
+        return {
+            "prompt": config["prompt"],
+            "aspect_ratio": aspect,
+            "size": config.get("size", default_size),
+            "target_size": config.get("target_size"),
+            "style_suffix": config.get("style_suffix"),
+        }
+    
+    def _generate_batch_item(
+        self,
+        name: str,
+        kwargs: dict,
+        output_path: Path,
+        manifest: JobManifest,
+        request_hash: str,
+    ) -> Path:
+        """Generate one batch item, recording its status and latency even on failure."""
+        start = time.time()
+        manifest.start(name, request_hash, output_path)
+        try:
+            self.generate(output_path=output_path, **kwargs)
+            manifest.done(name)
+            return output_path
+        except Exception as e:
+            manifest.fail(name, e)
+            raise
+        finally:
+            self.last_batch_timings[name] = time.time() - start
+    
+    def _plan_batch(
+        self,
+        prompts: dict[str, dict],
+        output_dir: Path,
+        default_aspect: AspectRatio,
+        default_size: ImageSize,
+        manifest: JobManifest,
+        resume: bool,
+    ) -> Tuple[dict[str, tuple], dict[str, Path]]:
+        """
+        Split a batch into items to run and items already completed.
+        
+        Returns:
+            (todo, skipped): todo maps name to (kwargs, output_path,
+            request_hash); skipped maps name to its existing output path.
+        """
+        todo, skipped = {}, {}
+        for name, config in prompts.items():
+            try:
+                kwargs = self._batch_item_kwargs(config, default_aspect, default_size)
+            except (KeyError, TypeError) as e:
+                self._log(f"⚠️  Failed {name}: invalid prompt config ({e})")
+                continue
+            output_path = output_dir / f"{name}.png"
+            request_hash = self._request_hash(**kwargs)
+            if resume and manifest.is_complete(name, request_hash, output_path):
+                skipped[name] = output_path
+                continue
+            todo[name] = (kwargs, output_path, request_hash)
+        
+        if skipped:
+            self._log(f"⏭️  Resuming: {len(skipped)} already done, {len(todo)} to generate\n")
+        return todo, skipped
+    
+    def _log_batch_summary(self, results: dict[str, Path], total: int, batch_start: float):
+        """Print the batch result count and per-item latency, slowest first."""
+        self._log(f"\n{'═' * 60}")
+        self._log(f"COMPLETE: {len(results)}/{total} images generated in {time.time() - batch_start:.1f}s")
+        for name, elapsed in sorted(self.last_batch_timings.items(), key=lambda x: x[1], reverse=True):
+            status = "ok" if name in results else "failed"
+            self._log(f"   {name:<30} {elapsed:6.1f}s  {status}")
+        self._log(f"{'═' * 60}\n")
+    
     def generate_batch(
         self,
         prompts: dict[str, dict],
         output_dir: Union[str, Path],
         default_aspect: AspectRatio = "1:1",
         default_size: ImageSize = "2K",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        resume: bool = False,
     ) -> dict[str, Path]:
         """
         Generate multiple images from a dictionary of prompts.
         
+        Up to ``max_workers`` Gemini requests run at once. A failing item is
+        logged and left out of the result; it does not affect the others.
+        Per-item latency is printed in the summary and kept in
+        ``self.last_batch_timings``.
+        
+        Every item's status, request hash, output path and timings are
+        recorded in ``<output_dir>/.manifest.json``. With ``resume=True``,
+        items that already completed for the same request are skipped.
+        
         Args:
             prompts: Dict mapping names to prompt configs.
                      Each config can have: prompt, aspect, size, target_size, style_suffix
             output_dir: Directory to save images.
             default_aspect: Default aspect ratio if not specified in prompt config.
             default_size: Default size if not specified in prompt config.
+            max_workers: Maximum number of concurrent generations (1 = sequential).
+            resume: Skip items the manifest records as done with an
+                    unchanged request and an existing output file.
         
         Returns:
-            Dict mapping names to saved file paths.
+            Dict mapping names to saved file paths, in the order of ``prompts``.
         
         Example:
             prompts = {
@@ -332,54 +599,143 @@ class ImageGenerator:
                     "target_size": (256, 256),
                 }
             }
-            results = gen.generate_batch(prompts, "output/")
+            results = gen.generate_batch(prompts, "output/", max_workers=8)
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        results = {}
         total = len(prompts)
+        max_workers = max(1, min(max_workers, total or 1))
+        self.last_batch_timings = {}
         
         self._log(f"\n{'═' * 60}")
-        self._log(f"BATCH GENERATION: {total} images")
+        self._log(f"BATCH GENERATION: {total} images ({max_workers} concurrent)")
         self._log(f"Output: {output_dir}")
         self._log(f"{'═' * 60}\n")
         
-        for i, (name, config) in enumerate(prompts.items(), 1):
-            self._log(f"\n[{i}/{total}] {name}")
-            self._log("-" * 40)
+        manifest = JobManifest.for_output_dir(output_dir)
+        todo, completed = self._plan_batch(
+            prompts, output_dir, default_aspect, default_size, manifest, resume
+        )
+        
+        # Initialize the client once, before any worker threads touch it
+        self.backend.get_client()
+        
+        batch_start = time.time()
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="imagegen") as pool:
+            futures = {
+                pool.submit(self._generate_batch_item, name, kwargs, output_path, manifest, request_hash): name
+                for name, (kwargs, output_path, request_hash) in todo.items()
+            }
             
-            try:
-                prompt = config.get("prompt", config) if isinstance(config, dict) else config
-                aspect = config.get("aspect", default_aspect) if isinstance(config, dict) else default_aspect
-                size = config.get("size", default_size) if isinstance(config, dict) else default_size
-                target = config.get("target_size") if isinstance(config, dict) else None
-                style = config.get("style_suffix") if isinstance(config, dict) else None
-                
-                # Map named aspects to actual ratios
-                if aspect in self.ASPECT_RATIOS:
-                    aspect = self.ASPECT_RATIOS[aspect]
-                
-                output_path = output_dir / f"{name}.png"
-                
-                self.generate(
-                    prompt=prompt,
-                    output_path=output_path,
-                    aspect_ratio=aspect,
-                    size=size,
-                    target_size=target,
-                    style_suffix=style,
-                )
-                
-                results[name] = output_path
-                
-            except Exception as e:
-                self._log(f"⚠️  Failed {name}: {e}")
+            for i, future in enumerate(as_completed(futures), len(completed) + 1):
+                name = futures[future]
+                try:
+                    completed[name] = future.result()
+                    self._log(f"[{i}/{total}] ✅ {name} ({self.last_batch_timings[name]:.1f}s)")
+                except Exception as e:
+                    self._log(f"[{i}/{total}] ⚠️  Failed {name}: {e}")
+        
+        # Keep the caller's ordering regardless of completion order
+        results = {name: completed[name] for name in prompts if name in completed}
+        
+        self._log_batch_summary(results, total, batch_start)
+        
+        return results
+    
+    async def agenerate_batch(
+        self,
+        prompts: dict[str, dict],
+        output_dir: Union[str, Path],
+        default_aspect: AspectRatio = "1:1",
+        default_size: ImageSize = "2K",
+        max_concurrency: int = 16,
+        resume: bool = False,
+    ) -> dict[str, Path]:
+        """
+        Async counterpart of generate_batch().
+        
+        All items are scheduled on the running event loop; an
+        ``asyncio.Semaphore`` keeps at most ``max_concurrency`` Gemini
+        requests in flight. Failures are isolated per item. If the batch
+        itself is cancelled, every pending item is cancelled before the
+        CancelledError propagates.
+        
+        Args:
+            prompts, output_dir, default_aspect, default_size, resume: Same as generate_batch().
+            max_concurrency: Maximum number of concurrent Gemini requests.
+        
+        Returns:
+            Dict mapping names to saved file paths, in the order of ``prompts``.
+        
+        Example:
+            results = asyncio.run(gen.agenerate_batch(prompts, "output/", max_concurrency=32))
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        total = len(prompts)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.last_batch_timings = {}
         
         self._log(f"\n{'═' * 60}")
-        self._log(f"COMPLETE: {len(results)}/{total} images generated")
+        self._log(f"ASYNC BATCH GENERATION: {total} images ({max_concurrency} concurrent)")
+        self._log(f"Output: {output_dir}")
         self._log(f"{'═' * 60}\n")
         
+        manifest = JobManifest.for_output_dir(output_dir)
+        todo, completed = self._plan_batch(
+            prompts, output_dir, default_aspect, default_size, manifest, resume
+        )
+        
+        self.backend.get_client()
+        
+        async def run_item(name: str, kwargs: dict, output_path: Path, request_hash: str) -> Path:
+            start = time.time()
+            manifest.start(name, request_hash, output_path)
+            try:
+                await self.agenerate(output_path=output_path, semaphore=semaphore, **kwargs)
+                manifest.done(name)
+                return output_path
+            except Exception as e:
+                manifest.fail(name, e)
+                raise
+            finally:
+                self.last_batch_timings[name] = time.time() - start
+        
+        batch_start = time.time()
+        tasks: dict[asyncio.Task, str] = {
+            asyncio.ensure_future(run_item(name, *item)): name
+            for name, item in todo.items()
+        }
+        
+        try:
+            pending = set(tasks)
+            done_count = len(completed)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_count += 1
+                    name = tasks[task]
+                    if task.cancelled():
+                        self._log(f"[{done_count}/{total}] 🛑 Cancelled {name}")
+                    elif task.exception() is not None:
+                        self._log(f"[{done_count}/{total}] ⚠️  Failed {name}: {task.exception()}")
+                    else:
+                        completed[name] = task.result()
+                        self._log(f"[{done_count}/{total}] ✅ {name} ({self.last_batch_timings[name]:.1f}s)")
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._log(f"🛑 Batch cancelled after {len(completed)}/{total} images")
+            raise
+        
+        results = {name: completed[name] for name in prompts if name in completed}
+        
+        self._log_batch_summary(results, total, batch_start)
+        
         return results
 
 
@@ -394,6 +750,9 @@ def generate_image(
     """
     Quick function to generate a single image.
     
+    Calls share the process-wide genai client, so a loop of generate_image()
+    calls reuses the same keep-alive connections.
+    
     Args:
         prompt: The image generation prompt.
         output_path: Optional path to save the image.
@@ -431,14 +790,21 @@ def remove_background(
     input_image: Union[str, Path, bytes],
     output_path: Optional[Union[str, Path]] = None,
     verbose: bool = True,
+    model: Optional[str] = None,
+    remover: Optional[BackgroundRemover] = None,
 ) -> bytes:
     """
     Remove background from an image using rembg.
     
+    The rembg model session is shared process-wide (see lib.background), so
+    repeated calls only pay model initialization once.
+    
     Args:
         input_image: Path to image file, or image bytes.
         output_path: Optional path to save the result.
         verbose: Whether to print progress.
+        model: rembg model name (default "u2net"). Ignored if remover is given.
+        remover: Explicit BackgroundRemover to use instead of the shared one.
     
     Returns:
         The image with transparent background as PNG bytes.
@@ -455,13 +821,14 @@ def remove_background(
         nobg = remove_background(img, "cat_nobg.png")
     """
     try:
-        from rembg import remove
         from PIL import Image
     except ImportError as e:
         print(f"❌ Missing package: {e}")
         print("   Install with: pip install rembg Pillow")
         sys.exit(1)
     
+    remover = remover or get_background_remover(model, verbose=verbose)
+    
     if verbose:
         print("🔲 Removing background...")
     
@@ -481,7 +848,7 @@ def remove_background(
         print(f"   📏 Size: {img.size}")
     
     # Remove background
-    img_nobg = remove(img)
+    img_nobg = remover(img)
     
     # Convert to bytes
     output = io.BytesIO()
@@ -502,6 +869,66 @@ def remove_background(
     return result
 
 
+def remove_background_batch(
+    input_dir: Union[str, Path],
+    output_dir: Optional[Union[str, Path]] = None,
+    pattern: str = "*.png",
+    model: Optional[str] = None,
+    verbose: bool = True,
+) -> dict[str, Path]:
+    """
+    Remove the background from every matching image in a directory.
+    
+    The rembg model is loaded once and reused for every file. A failing file
+    is reported and skipped.
+    
+    Args:
+        input_dir: Directory containing the source images.
+        output_dir: Where to write results (same file names, PNG).
+                    Defaults to ``<input_dir>/nobg``.
+        pattern: Glob pattern selecting the input files.
+        model: rembg model name (default "u2net").
+        verbose: Whether to print progress.
+    
+    Returns:
+        Dict mapping input file stems to saved output paths.
+    
+    Example:
+        remove_background_batch("images/logos", "images/logos_nobg", model="isnet-general-use")
+    """
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir) if output_dir else input_dir / "nobg"
+    files = sorted(p for p in input_dir.glob(pattern) if p.is_file())
+    
+    if verbose:
+        print(f"\n{'═' * 60}")
+        print(f"BACKGROUND REMOVAL: {len(files)} images ({model or DEFAULT_REMBG_MODEL})")
+        print(f"Input:  {input_dir}")
+        print(f"Output: {output_dir}")
+        print(f"{'═' * 60}\n")
+    
+    remover = get_background_remover(model, verbose=verbose).load()
+    results = {}
+    start = time.time()
+    
+    for i, path in enumerate(files, 1):
+        output_path = output_dir / f"{path.stem}.png"
+        item_start = time.time()
+        try:
+            remove_background(path, output_path, verbose=False, remover=remover)
+            results[path.stem] = output_path
+            if verbose:
+                print(f"[{i}/{len(files)}] ✅ {path.name} ({time.time() - item_start:.1f}s)")
+        except Exception as e:
+            if verbose:
+                print(f"[{i}/{len(files)}] ⚠️  Failed {path.name}: {e}")
+    
+    if verbose:
+        print(f"\nCOMPLETE: {len(results)}/{len(files)} images in {time.time() - start:.1f}s")
+    
+    return results
+
+
 if __name__ == "__main__":
     # Quick test
     print("Testing image generation...")
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Mail Merge: Records → PDFs
+==========================
+Fill a Jinja2 HTML template once per record from a CSV, JSON or JSON
+Lines file and render every filled copy to PDF with weasyprint.
+
+Records are rendered in a process pool; each worker keeps one Jinja
+environment and one lib.weasy_render.WeasyRenderer, so fonts, CSS and
+the logo are loaded once per worker, not once per document. The PDFs can
+optionally be concatenated, in record order, into a single merged file.
+
+render_template() renders a template once without a record (the blank
+form, with the template's own placeholder defaults).
+
+Every record is rendered with these extra template variables:
+    index       1-based record number
+    today       Today's date, e.g. "March 31, 2026"
+    year        Current year
+    date_in(n)  The date n days from today, formatted like today
+and the ``money`` (1234.5 → "$1,234.50") and ``number`` ("$1,234.5" →
+1234.5) filters.
+
+CSV cells that hold a JSON array or object (e.g. an ``items`` column of
+line items) are decoded, so CSV and JSON inputs can drive the same
+template.
+
+Usage:
+    from lib.mail_merge import load_records, mail_merge
+
+    results = mail_merge(
+        "KERNELKEYS/templates/quotation.html",
+        load_records("quotes.csv"),
+        output_dir="quotes_q1",
+        name_pattern="{{ quote_number }}",
+        merged_path="quotes_q1/all_quotes.pdf",
+    )
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    from .weasy_render import WeasyRenderer
+except ImportError:  # running this file directly as a script
+    from weasy_render import WeasyRenderer
+
+DEFAULT_NAME_PATTERN = "{{ template }}_{{ '%04d' | format(index) }}"
+DATE_FORMAT = "%B %d, %Y"
+
+
+def _decode_cell(value):
+    """Decode CSV cells that contain a JSON array/object; leave the rest as text."""
+    if isinstance(value, str) and value[:1] in "[{":
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
+
+def _decode_record(record: dict) -> dict:
+    """Decode JSON-encoded string fields (e.g. "items": "[...]") like CSV cells."""
+    return {key: _decode_cell(value) for key, value in record.items()}
+
+
+def load_records(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Yield records from a CSV, JSON or JSON Lines file.
+
+    JSON may be a list of objects or an object with a "records" list.
+    Fields holding a JSON array/object as a string are decoded in every
+    format, so "items" may be given either way.
+
+    Args:
+        path: Data file (.csv, .json, .jsonl).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield {key: _decode_cell(value) for key, value in row.items()}
+    elif suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield _decode_record(json.loads(line))
+    elif suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for record in data["records"] if isinstance(data, dict) else data:
+            yield _decode_record(record)
+    else:
+        raise ValueError(f"Unsupported data file {path.name} (expected .csv, .json or .jsonl)")
+
+
+def _number(value) -> float:
+    """Jinja filter: 1234.5, "1234.5" or "$1,234.5" → 1234.5 (blank → 0)."""
+    if isinstance(value, str):
+        value = re.sub(r"[^0-9.\-]", "", value) or 0
+    return float(value or 0)
+
+
+def _money(value) -> str:
+    """Jinja filter: 1234.5 or "$1,234.5" → "$1,234.50"."""
+    return f"${_number(value):,.2f}"
+
+
+def _environment(template_dir: Path):
+    try:
+        import jinja2
+    except ImportError:
+        print("❌ Jinja2 not installed.")
+        print("   Install with: pip install Jinja2")
+        sys.exit(1)
+
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(template_dir)),
+        autoescape=jinja2.select_autoescape(["html", "htm"], default_for_string=False),
+    )
+    today = date.today()
+    env.filters["money"] = _money
+    env.filters["number"] = _number
+    env.globals.update(
+        today=today.strftime(DATE_FORMAT),
+        year=today.year,
+        date_in=lambda days: (today + timedelta(days=days)).strftime(DATE_FORMAT),
+    )
+    return env
+
+
+def _safe_filename(name: str) -> str:
+    name = re.sub(r"[^\w.\-]+", "_", name.strip()).strip("._")
+    return name or "document"
+
+
+class _Merger:
+    """Compiled template and renderer for one process."""
+
+    def __init__(self, template_path: Path, renderer: Optional[WeasyRenderer] = None):
+        self.template_path = template_path
+        self.template = _environment(template_path.parent).get_template(template_path.name)
+        self.renderer = renderer or WeasyRenderer()
+
+    def render(
+        self,
+        index: Optional[int],
+        record: dict,
+        output_path: Path,
+        stylesheets: Optional[list] = None,
+    ) -> tuple[Path, float]:
+        context = dict(record) if index is None else dict(record, index=index)
+        html = self.template.render(context)
+        elapsed = self.renderer.render_string(
+            html, output_path, base_url=self.template_path.parent, stylesheets=stylesheets
+        )
+        return output_path, elapsed
+
+
+class _OutputNamer:
+    """Turns records into unique PDF paths using the name pattern."""
+
+    def __init__(self, template_path: Path, name_pattern: str, output_dir: Path):
+        self.template_name = template_path.stem
+        self.name_template = _environment(template_path.parent).from_string(name_pattern)
+        self.output_dir = output_dir
+        self._used: set[str] = set()
+
+    def __call__(self, index: int, record: dict) -> Path:
+        name = _safe_filename(self.name_template.render(record, index=index, template=self.template_name))
+        unique, n = name, 1
+        while unique in self._used:
+            n += 1
+            unique = f"{name}_{n}"
+        self._used.add(unique)
+        return self.output_dir / f"{unique}.pdf"
+
+
+_merger: Optional[_Merger] = None
+
+
+def _init_worker(template_path: Path):
+    global _merger
+    _merger = _Merger(template_path)
+
+
+def _render_record(index: int, record: dict, output_path: Path) -> tuple[Path, float]:
+    """Worker task: fill and render one record."""
+    return _merger.render(index, record, output_path)
+
+
+def render_template(
+    template_path: Union[str, Path],
+    output_path: Union[str, Path],
+    record: Optional[dict] = None,
+    renderer: Optional[WeasyRenderer] = None,
+    stylesheets: Optional[list] = None,
+) -> float:
+    """
+    Render a template once, outside a mail merge.
+
+    Without a record the template's own placeholders ("[Client Name]",
+    "[Date]", ...) are kept, i.e. the PDF is the blank form. ``index`` is
+    left undefined so templates can tell a blank render from a merge.
+
+    Args:
+        template_path: Jinja2 HTML template.
+        output_path: PDF to write.
+        record: Values to fill in (default: none).
+        renderer: Shared renderer to reuse (a new one is created if None).
+        stylesheets: Extra CSS objects from renderer.stylesheet().
+
+    Returns:
+        Render time in seconds.
+    """
+    merger = _Merger(Path(template_path).resolve(), renderer)
+    return merger.render(None, record or {}, Path(output_path), stylesheets)[1]
+
+
+def merge_pdfs(pdf_paths: list[Path], merged_path: Union[str, Path]) -> Path:
+    """
+    Concatenate PDFs, in the given order, into one file.
+
+    Args:
+        pdf_paths: PDFs to append.
+        merged_path: Output file.
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        print("❌ pypdf not installed (needed for a merged PDF).")
+        print("   Install with: pip install pypdf")
+        sys.exit(1)
+
+    merged_path = Path(merged_path)
+    merged_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = PdfWriter()
+    for pdf_path in pdf_paths:
+        writer.append(str(pdf_path))
+    with open(merged_path, "wb") as f:
+        writer.write(f)
+    writer.close()
+    return merged_path
+
+
+def mail_merge(
+    template_path: Union[str, Path],
+    records: Iterable[dict],
+    output_dir: Union[str, Path],
+    name_pattern: str = DEFAULT_NAME_PATTERN,
+    merged_path: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> dict[int, Union[Path, Exception]]:
+    """
+    Render one PDF per record.
+
+    Args:
+        template_path: Jinja2 HTML template. Relative links (images, CSS)
+                       resolve against its directory.
+        records: Template contexts, e.g. from load_records(). Consumed
+                 lazily, so large files are not loaded up front.
+        output_dir: Directory for the PDFs.
+        name_pattern: Jinja expression for each file name (without .pdf),
+                      rendered with the record plus ``index`` and
+                      ``template``. Defaults to "<template>_0001";
+                      repeated names get a "_2", "_3", ... suffix.
+        merged_path: If given, also write all PDFs (in record order) here.
+        workers: Worker processes (default: CPU count). 1 renders in
+                 this process.
+        max_in_flight: Records queued at once (default: 4 per worker).
+
+    Returns:
+        Mapping of record index to its PDF path, or to the exception it raised.
+    """
+    template_path = Path(template_path).resolve()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    max_in_flight = max(workers, max_in_flight or workers * 4)
+
+    print(f"\n{'═' * 60}")
+    print(f"MAIL MERGE: {template_path.name} → {output_dir} ({workers} worker(s))")
+    print(f"{'═' * 60}\n")
+
+    output_path_for = _OutputNamer(template_path, name_pattern, output_dir)
+    results: dict[int, Union[Path, Exception]] = {}
+    render_time = 0.0
+    start = time.time()
+
+    def record_result(index: int, outcome):
+        nonlocal render_time
+        if isinstance(outcome, Exception):
+            results[index] = outcome
+            print(f"⚠️  Record {index} failed: {outcome}")
+            return
+        output_path, elapsed = outcome
+        results[index] = output_path
+        render_time += elapsed
+        print(f"✅ {output_path.name} ({elapsed:.2f}s)")
+
+    if workers == 1:
+        merger = _Merger(template_path)
+        for index, record in enumerate(records, start=1):
+            try:
+                record_result(index, merger.render(index, record, output_path_for(index, record)))
+            except Exception as e:
+                record_result(index, e)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(template_path,),
+        ) as pool:
+            pending = {}
+
+            def drain(return_when):
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        record_result(index, future.result())
+                    except Exception as e:
+                        record_result(index, e)
+
+            for index, record in enumerate(records, start=1):
+                if len(pending) >= max_in_flight:
+                    drain(FIRST_COMPLETED)
+                try:
+                    output_path = output_path_for(index, record)
+                except Exception as e:
+                    record_result(index, e)
+                    continue
+                pending[pool.submit(_render_record, index, record, output_path)] = index
+            if pending:
+                drain(ALL_COMPLETED)
+
+    total = time.time() - start
+    written = [results[i] for i in sorted(results) if isinstance(results[i], Path)]
+
+    if merged_path and written:
+        merge_start = time.time()
+        merge_pdfs(written, merged_path)
+        print(f"📎 Merged {len(written)} PDFs → {merged_path} ({time.time() - merge_start:.2f}s)")
+
+    failed = len(results) - len(written)
+    rate = len(written) / total * 60 if total > 0 else 0.0
+    print(f"\n{'═' * 60}")
+    print(f"✅ {len(written)} PDFs in {total:.1f}s ({rate:.0f}/min)")
+    if written:
+        print(f"   Average render: {render_time / len(written):.2f}s per document")
+    if failed:
+        print(f"   ⚠️  {failed} record(s) failed")
+    print(f"{'═' * 60}")
+    return results
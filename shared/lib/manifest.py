@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Resumable Batch Job Manifest
+============================
+A small JSON file next to a batch's output directory that records, per
+item: status, request hash, output path, and timings.
+
+If a batch dies halfway, re-running it with ``resume=True`` skips every
+item that already finished with the same request hash (and whose output
+file still exists), so only failed, missing or changed items are paid for
+again.
+
+Usage:
+    from lib.manifest import JobManifest
+
+    manifest = JobManifest.for_output_dir("images/generated")
+    if not manifest.is_complete("hero", request_hash, output_path):
+        manifest.start("hero", request_hash, output_path)
+        try:
+            generate(...)
+            manifest.done("hero")
+        except Exception as e:
+            manifest.fail("hero", e)
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Union
+
+
+class JobManifest:
+    """
+    Per-item status of a batch job, persisted as JSON after every update.
+
+    Item statuses are "running", "done" and "failed". An item left in
+    "running" means the process died while working on it.
+
+    Attributes:
+        FILENAME: Manifest file name used by for_output_dir().
+        path: Location of the manifest file.
+        items: Mapping of item name to its record.
+    """
+
+    FILENAME = ".manifest.json"
+    VERSION = 1
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Load a manifest, or start an empty one if the file does not exist.
+
+        Args:
+            path: Manifest file location.
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._started: dict[str, float] = {}
+        self.items: dict[str, dict] = {}
+
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self.items = data.get("items", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"⚠️  Ignoring unreadable manifest {self.path}: {e}")
+
+    @classmethod
+    def for_output_dir(cls, output_dir: Union[str, Path]) -> "JobManifest":
+        """Manifest stored inside a batch output directory."""
+        return cls(Path(output_dir) / cls.FILENAME)
+
+    def is_complete(self, name: str, request_hash: str, output_path: Union[str, Path]) -> bool:
+        """Whether an item already finished for this exact request and its output still exists."""
+        item = self.items.get(name)
+        return (
+            item is not None
+            and item.get("status") == "done"
+            and item.get("request_hash") == request_hash
+            and Path(output_path).exists()
+        )
+
+    def start(self, name: str, request_hash: str, output_path: Union[str, Path]):
+        """Mark an item as running."""
+        with self._lock:
+            self._started[name] = time.time()
+            previous = self.items.get(name, {})
+            self.items[name] = {
+                "status": "running",
+                "request_hash": request_hash,
+                "output_path": str(output_path),
+                "attempts": previous.get("attempts", 0) + 1,
+                "started_at": _now(),
+            }
+            self._save()
+
+    def done(self, name: str):
+        """Mark an item as finished successfully."""
+        self._finish(name, "done")
+
+    def fail(self, name: str, error: BaseException):
+        """Mark an item as failed, keeping the error message."""
+        self._finish(name, "failed", error=f"{type(error).__name__}: {error}")
+
+    def _finish(self, name: str, status: str, **extra):
+        with self._lock:
+            item = self.items.setdefault(name, {})
+            started = self._started.pop(name, None)
+            item.update(status=status, finished_at=_now(), **extra)
+            if started is not None:
+                item["elapsed_s"] = round(time.time() - started, 2)
+            if status == "done":
+                item.pop("error", None)
+            self._save()
+
+    def summary(self) -> dict[str, int]:
+        """Item counts by status."""
+        counts: dict[str, int] = {}
+        for item in self.items.values():
+            status = item.get("status", "unknown")
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def _save(self):
+        """Atomically write the manifest. Lock held."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"version": self.VERSION, "items": self.items}, indent=2, sort_keys=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Markdown → DOCX
+===============
+Shared Word backend for the patent filing scripts.
+
+The markdown is read once into a stream of block tokens (headings,
+paragraphs, list items, tables, code blocks, rules) using precompiled
+patterns, and a renderer turns each token into python-docx objects.
+Inline **bold**, *italic*, `code`, links and backslash escapes become
+real runs instead of being stripped; pipe tables become Word tables.
+Consecutive lines of a paragraph are kept as line breaks, matching the
+nl2br PDFs.
+
+Two renderers share the token stream:
+    "simple"  Word heading styles (SBIR patent directories)
+    "uspto"   37 CFR 1.52 layout: 1" margins, Times 12 pt at 1.5 spacing,
+              centered section headers, [0001] paragraph numbers,
+              "1. (Original) ..." claims, page numbers in the footer
+
+Usage:
+    from lib.md_docx import md_to_docx
+
+    md_to_docx("draft.md", "SPECIFICATION.docx")
+    md_to_docx("provisional.md", "SPECIFICATION.docx", style="uspto")
+
+    # Tokens only
+    from lib.md_docx import tokenize
+    for token in tokenize(Path("draft.md").read_text()):
+        print(token.kind, token.text[:40])
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Union
+
+# Block patterns
+_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_HR_RE = re.compile(r"^ {0,3}([-*_])(?:\s*\1){2,}\s*$")
+_FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})\s*([\w+-]*)")
+_LIST_RE = re.compile(r"^(\s*)([-*+]|\d{1,9}[.)])\s+(.*)$")
+_QUOTE_RE = re.compile(r"^\s*>\s?(.*)$")
+_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+
+# Inline spans: **bold** / __bold__, *italic*, `code`, [text](url), \escape
+_INLINE_RE = re.compile(
+    r"(?P<bold>\*\*|__)(?P<bold_text>.+?)(?P=bold)"
+    r"|\*(?P<italic_text>[^\s*](?:.*?[^\s*])?)\*"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\([^)]*\)"
+    r"|\\(?P<escaped>[\\`*_{}\[\]()#+\-.!|>~])",
+    re.DOTALL,
+)
+
+# USPTO paragraph numbers, claims and field labels
+_PARA_NUM_RE = re.compile(r"^\[(\d{4,})\]\s*(.*)$", re.DOTALL)
+_CLAIM_STATUS_RE = re.compile(r"^\((\w[\w ]*)\)\s*(.*)$", re.DOTALL)
+_FIELD_LABEL_RE = re.compile(r"^\*\*[^*\n]+:\*\*")
+
+INDENT = 2  # spaces per nesting level
+
+
+@dataclass
+class Token:
+    """
+    One markdown block.
+
+    Attributes:
+        kind: "heading", "paragraph", "list_item", "table", "code", "quote" or "hr".
+        text: Inline markdown (lines joined with "\\n"), or raw code.
+        level: Heading level, or nesting depth for list items/paragraphs.
+        ordered: For list items, whether the marker was a number.
+        number: For ordered list items, the number written in the source.
+        rows: For tables, header row first, each a list of cell texts.
+    """
+
+    kind: str
+    text: str = ""
+    level: int = 0
+    ordered: bool = False
+    number: int = 0
+    rows: list = field(default_factory=list)
+
+
+def _indent_level(spaces: str) -> int:
+    return len(spaces.expandtabs(4)) // INDENT
+
+
+def _split_row(line: str) -> list[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in _CELL_SPLIT_RE.split(line)]
+
+
+def _is_table_start(line: str, next_line: str) -> bool:
+    return "|" in line and "|" in next_line and bool(_TABLE_SEP_RE.match(next_line))
+
+
+def _starts_block(line: str, next_line: str) -> bool:
+    """Whether line opens a new block (ending any open paragraph)."""
+    return bool(
+        _HEADING_RE.match(line)
+        or _HR_RE.match(line)
+        or _FENCE_RE.match(line)
+        or _LIST_RE.match(line)
+        or _QUOTE_RE.match(line)
+        or _is_table_start(line, next_line)
+    )
+
+
+def tokenize(md_text: str) -> Iterator[Token]:
+    """
+    Split markdown into block tokens in one pass over its lines.
+
+    Args:
+        md_text: Markdown source.
+
+    Yields:
+        Token objects in document order.
+    """
+    lines = md_text.splitlines()
+    n = len(lines)
+    i = 0
+    while i < n:
+        line = lines[i]
+        next_line = lines[i + 1] if i + 1 < n else ""
+
+        if not line.strip():
+            i += 1
+            continue
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(1)
+            body = []
+            i += 1
+            while i < n and not lines[i].strip().startswith(marker):
+                body.append(lines[i])
+                i += 1
+            i += 1  # closing fence
+            yield Token("code", "\n".join(body))
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            yield Token("heading", heading.group(2), level=len(heading.group(1)))
+            i += 1
+            continue
+
+        if _HR_RE.match(line):
+            yield Token("hr")
+            i += 1
+            continue
+
+        if _is_table_start(line, next_line):
+            rows = [_split_row(line)]
+            i += 2
+            while i < n and "|" in lines[i] and lines[i].strip():
+                rows.append(_split_row(lines[i]))
+                i += 1
+            yield Token("table", rows=rows)
+            continue
+
+        quote = _QUOTE_RE.match(line)
+        if quote:
+            body = [quote.group(1).rstrip()]
+            i += 1
+            while i < n and (match := _QUOTE_RE.match(lines[i])):
+                body.append(match.group(1).rstrip())
+                i += 1
+            yield Token("quote", "\n".join(body))
+            continue
+
+        item = _LIST_RE.match(line)
+        if item:
+            indent, marker, text = item.groups()
+            level = _indent_level(indent)
+            body = [text.rstrip()]
+            i += 1
+            # Lazy continuation lines belong to the item
+            while i < n and lines[i].strip() and not _starts_block(lines[i], lines[i + 1] if i + 1 < n else ""):
+                body.append(lines[i].strip())
+                i += 1
+            ordered = marker[0].isdigit()
+            yield Token(
+                "list_item",
+                "\n".join(body),
+                level=level,
+                ordered=ordered,
+                number=int(marker[:-1]) if ordered else 0,
+            )
+            continue
+
+        # Paragraph: this line plus every following line that doesn't open a block
+        level = _indent_level(line[:len(line) - len(line.lstrip())])
+        body = [line.strip()]
+        i += 1
+        while i < n and lines[i].strip() and not _starts_block(lines[i], lines[i + 1] if i + 1 < n else ""):
+            body.append(lines[i].strip())
+            i += 1
+        yield Token("paragraph", "\n".join(body), level=level)
+
+
+@dataclass
+class Span:
+    """A run of text with uniform formatting."""
+
+    text: str
+    bold: bool = False
+    italic: bool = False
+    code: bool = False
+
+
+def parse_inline(text: str, bold: bool = False, italic: bool = False) -> list[Span]:
+    """
+    Split inline markdown into formatted spans.
+
+    Args:
+        text: Inline markdown.
+        bold, italic: Formatting inherited from an enclosing span.
+    """
+    spans: list[Span] = []
+    pos = 0
+    for match in _INLINE_RE.finditer(text):
+        if match.start() > pos:
+            spans.append(Span(text[pos:match.start()], bold, italic))
+        if match.group("bold_text") is not None:
+            spans.extend(parse_inline(match.group("bold_text"), True, italic))
+        elif match.group("italic_text") is not None:
+            spans.extend(parse_inline(match.group("italic_text"), bold, True))
+        elif match.group("code") is not None:
+            spans.append(Span(match.group("code"), bold, italic, code=True))
+        elif match.group("link_text") is not None:
+            spans.extend(parse_inline(match.group("link_text"), bold, italic))
+        else:
+            spans.append(Span(match.group("escaped"), bold, italic))
+        pos = match.end()
+    if pos < len(text):
+        spans.append(Span(text[pos:], bold, italic))
+    return spans
+
+
+def plain_text(text: str) -> str:
+    """Inline markdown with all formatting removed."""
+    return "".join(span.text for span in parse_inline(text))
+
+
+def _load_docx():
+    try:
+        import docx
+    except ImportError:
+        print("❌ python-docx not installed.")
+        print("   Install with: pip install python-docx")
+        sys.exit(1)
+    return docx
+
+
+class DocxRenderer:
+    """
+    Renders tokens with Word's built-in heading and list styles.
+
+    Subclasses override render_<kind>() for a different layout.
+    """
+
+    CODE_FONT = "Courier New"
+
+    def __init__(self):
+        docx = _load_docx()
+        from docx.shared import Inches, Pt
+
+        self.Inches, self.Pt = Inches, Pt
+        self.doc = docx.Document()
+        self.setup()
+
+    def setup(self):
+        """Page and Normal style setup."""
+        style = self.doc.styles["Normal"]
+        style.font.name = "Times New Roman"
+        style.font.size = self.Pt(12)
+
+    def add_runs(self, paragraph, text: str, bold: bool = False):
+        """Append the inline markdown text to a paragraph as formatted runs."""
+        for span in parse_inline(text, bold=bold):
+            run = paragraph.add_run(span.text)
+            run.bold = span.bold or None
+            run.italic = span.italic or None
+            if span.code:
+                run.font.name = self.CODE_FONT
+                run.font.size = self.Pt(10)
+        return paragraph
+
+    def render(self, tokens) -> "DocxRenderer":
+        for token in tokens:
+            getattr(self, f"render_{token.kind}")(token)
+        return self
+
+    def render_heading(self, token: Token):
+        heading = self.doc.add_heading(level=min(token.level, 9))
+        self.add_runs(heading, token.text)
+
+    def render_paragraph(self, token: Token):
+        p = self.add_runs(self.doc.add_paragraph(), token.text)
+        if token.level:
+            p.paragraph_format.left_indent = self.Inches(0.5 * token.level)
+
+    def render_list_item(self, token: Token):
+        style = "List Number" if token.ordered else "List Bullet"
+        if token.level:
+            style += f" {min(token.level + 1, 3)}"
+        self.add_runs(self.doc.add_paragraph(style=style), token.text)
+
+    def render_quote(self, token: Token):
+        p = self.doc.add_paragraph()
+        p.paragraph_format.left_indent = self.Inches(0.5)
+        for span in parse_inline(token.text):
+            p.add_run(span.text).italic = True
+
+    def render_code(self, token: Token):
+        run = self.doc.add_paragraph().add_run(token.text)
+        run.font.name = self.CODE_FONT
+        run.font.size = self.Pt(10)
+
+    def render_table(self, token: Token):
+        width = max(len(row) for row in token.rows)
+        table = self.doc.add_table(rows=len(token.rows), cols=width)
+        table.style = "Table Grid"
+        for r, row in enumerate(token.rows):
+            cells = table.rows[r].cells
+            for c, text in enumerate(row):
+                self.add_runs(cells[c].paragraphs[0], text, bold=(r == 0))
+
+    def render_hr(self, token: Token):
+        self.doc.add_paragraph("_" * 50)
+
+
+class UsptoDocxRenderer(DocxRenderer):
+    """USPTO specification layout (see module docstring)."""
+
+    def setup(self):
+        for section in self.doc.sections:
+            section.top_margin = section.bottom_margin = self.Inches(1)
+            section.left_margin = section.right_margin = self.Inches(1)
+            section.page_width = self.Inches(8.5)
+            section.page_height = self.Inches(11)
+
+        style = self.doc.styles["Normal"]
+        style.font.name = "Times New Roman"
+        style.font.size = self.Pt(12)
+        style.paragraph_format.line_spacing = 1.5
+
+    def render(self, tokens) -> "UsptoDocxRenderer":
+        super().render(tokens)
+        add_page_numbers(self.doc)
+        return self
+
+    def render_heading(self, token: Token):
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        p = self.doc.add_paragraph()
+        run = p.add_run(plain_text(token.text))
+        run.bold = True
+        run.font.size = self.Pt(14 if token.level == 1 else 12)
+        if token.level <= 2:
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if token.level >= 2:
+            p.paragraph_format.space_before = self.Pt(12)
+
+    def render_paragraph(self, token: Token):
+        text = token.text
+        if plain_text(text).strip() == "End of Specification":
+            return
+
+        p = self.doc.add_paragraph()
+        if _FIELD_LABEL_RE.match(text):
+            # **Title:** value
+            self.add_runs(p, text)
+            return
+
+        para = _PARA_NUM_RE.match(text)
+        if para:
+            p.add_run(f"[{para.group(1)}] ")
+            text = para.group(2)
+        self.add_runs(p, text)
+        p.paragraph_format.first_line_indent = self.Inches(0.5)
+        if token.level:
+            p.paragraph_format.left_indent = self.Inches(0.5 * token.level)
+
+    def render_list_item(self, token: Token):
+        claim = _CLAIM_STATUS_RE.match(token.text) if token.ordered else None
+        if claim:
+            # 1. (Original) An automated ...
+            p = self.doc.add_paragraph()
+            p.paragraph_format.first_line_indent = self.Inches(0.5)
+            p.paragraph_format.space_before = self.Pt(6)
+            p.add_run(f"{token.number}. ({claim.group(1)}) ")
+            self.add_runs(p, claim.group(2))
+            return
+        super().render_list_item(token)
+
+    def render_hr(self, token: Token):
+        pass  # section breaks are implied by the centered headers
+
+
+RENDERERS = {
+    "simple": DocxRenderer,
+    "uspto": UsptoDocxRenderer,
+}
+
+
+def add_page_numbers(doc):
+    """Add a centered PAGE field to every section footer."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    for section in doc.sections:
+        footer = section.footer
+        footer.is_linked_to_previous = False
+
+        p = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = p.add_run()
+
+        fld_begin = OxmlElement("w:fldChar")
+        fld_begin.set(qn("w:fldCharType"), "begin")
+        instr_text = OxmlElement("w:instrText")
+        instr_text.text = "PAGE"
+        fld_end = OxmlElement("w:fldChar")
+        fld_end.set(qn("w:fldCharType"), "end")
+
+        run._r.append(fld_begin)
+        run._r.append(instr_text)
+        run._r.append(fld_end)
+
+
+def markdown_to_document(md_text: str, style: str = "simple"):
+    """
+    Build a python-docx Document from markdown text.
+
+    Args:
+        md_text: Markdown source.
+        style: Renderer name from RENDERERS.
+    """
+    return RENDERERS[style]().render(tokenize(md_text)).doc
+
+
+def md_to_docx(input_file: Union[str, Path], output_file: Union[str, Path], style: str = "simple") -> Path:
+    """
+    Convert a markdown file to DOCX.
+
+    Args:
+        input_file: Markdown source.
+        output_file: DOCX to write.
+        style: "simple" (Word heading styles) or "uspto".
+
+    Returns:
+        The output path.
+    """
+    if style not in RENDERERS:
+        raise ValueError(f"Unknown DOCX style {style!r} (expected one of {sorted(RENDERERS)})")
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    markdown_to_document(Path(input_file).read_text(), style).save(str(output_file))
+    return output_file
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Patent Filing Document Pipeline
+===============================
+Build the PDF and DOCX files of one or more patent filing directories
+from a ``patent_build.json`` manifest in each directory.
+
+Every document of every filing becomes one lib.doc_build target, so a
+whole set of filings renders in a single process pool and only documents
+whose markdown, images, CSS or manifest entry changed are rebuilt (each
+directory keeps its own .build_stamp.json). Inside a worker the markdown
+parser, the weasyprint session (fonts, parsed CSS, images) and the
+python-docx backend (lib.md_docx) are created once and reused for every
+document that worker renders.
+
+Manifest (patent_build.json):
+    {
+        "title": "USPTO Provisional — Hybrid Compute Optimization",
+        "css": ["patent.css"],
+        "base_css": true,
+        "markdown_extensions": ["tables", "fenced_code", "toc"],
+        "docx_style": "simple",
+        "documents": [
+            {"source": "draft.md", "output": "SPECIFICATION", "formats": ["pdf", "docx"]},
+            {"source": "COVER_SHEET.md", "output": "COVER_SHEET"}
+        ],
+        "checklist": ["SPECIFICATION.pdf / SPECIFICATION.docx", "COVER_SHEET.pdf"]
+    }
+
+    css                  Stylesheets (relative to the manifest) applied on
+                         top of PATENT_CSS. Optional.
+    base_css             false to use only the manifest's stylesheets
+                         (e.g. to keep a filing's established layout).
+                         Default: true.
+    markdown_extensions  Python-Markdown extensions for the PDFs.
+                         Default: tables, fenced_code, toc.
+    docx_style           lib.md_docx style: "simple" or "uspto".
+    documents[].formats  Default: ["pdf"].
+    checklist            Files to upload, printed after the build. Optional.
+
+Usage:
+    # Every filing under shared/ that has a patent_build.json
+    python -m lib.patent_docs
+
+    # Selected filings, one document at a time, ignoring build stamps
+    python -m lib.patent_docs food_patent SBIR/IP/patents/* --workers 1 --force
+
+    from lib.patent_docs import build_filings
+    build_filings(["food_patent"])
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    from .doc_build import BuildStamp, BuildTarget, build_targets, markdown_inputs
+    from .md_docx import RENDERERS, md_to_docx
+except ImportError:  # running this file directly as a script
+    from doc_build import BuildStamp, BuildTarget, build_targets, markdown_inputs
+    from md_docx import RENDERERS, md_to_docx
+
+MANIFEST_NAME = "patent_build.json"
+DEFAULT_EXTENSIONS = ("tables", "fenced_code", "toc")
+FORMATS = ("pdf", "docx")
+PATENT_CENTER_URL = "https://patentcenter.uspto.gov"
+
+# Base USPTO layout (37 CFR 1.52) shared by every filing; a manifest's
+# own stylesheets are applied after it.
+PATENT_CSS = """
+@page {
+    size: letter;
+    margin: 1in;
+}
+body {
+    font-family: "Times New Roman", Times, serif;
+    font-size: 12pt;
+    line-height: 1.5;
+}
+h1 {
+    font-size: 16pt;
+    font-weight: bold;
+    margin-top: 24pt;
+    margin-bottom: 12pt;
+}
+h2 {
+    font-size: 14pt;
+    font-weight: bold;
+    margin-top: 18pt;
+    margin-bottom: 10pt;
+}
+h3 {
+    font-size: 12pt;
+    font-weight: bold;
+    margin-top: 14pt;
+    margin-bottom: 8pt;
+}
+table {
+    border-collapse: collapse;
+    margin: 10pt 0;
+    width: 100%;
+}
+th, td {
+    border: 1px solid black;
+    padding: 6pt 8pt;
+    text-align: left;
+}
+th {
+    background-color: #f0f0f0;
+}
+code {
+    font-family: "Courier New", Courier, monospace;
+    font-size: 10pt;
+    background-color: #f5f5f5;
+    padding: 2pt 4pt;
+}
+pre {
+    font-family: "Courier New", Courier, monospace;
+    font-size: 10pt;
+    background-color: #f5f5f5;
+    padding: 10pt;
+    margin: 10pt 0;
+    white-space: pre-wrap;
+    word-wrap: break-word;
+}
+blockquote {
+    border-left: 3pt solid #ccc;
+    margin-left: 0;
+    padding-left: 12pt;
+    font-style: italic;
+}
+hr {
+    border: none;
+    border-top: 1pt solid #ccc;
+    margin: 20pt 0;
+}
+ul, ol {
+    margin: 10pt 0;
+    padding-left: 20pt;
+}
+"""
+
+_HTML_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+@dataclass
+class FilingDocument:
+    """
+    One markdown source and the outputs built from it.
+
+    Attributes:
+        source: Markdown file.
+        output: Output path without extension (e.g. .../SPECIFICATION).
+        formats: Output formats, a subset of FORMATS.
+    """
+
+    source: Path
+    output: Path
+    formats: tuple = ("pdf",)
+
+
+@dataclass
+class FilingManifest:
+    """
+    A patent filing directory as described by its patent_build.json.
+
+    Attributes:
+        directory: The filing directory.
+        title: Heading printed for the filing.
+        css: Stylesheet files applied on top of PATENT_CSS.
+        base_css: Whether PATENT_CSS is applied at all.
+        markdown_extensions: Python-Markdown extensions for the PDFs.
+        docx_style: lib.md_docx renderer name.
+        documents: Documents to build.
+        checklist: Lines printed after the build.
+    """
+
+    directory: Path
+    title: str
+    css: list = field(default_factory=list)
+    base_css: bool = True
+    markdown_extensions: tuple = DEFAULT_EXTENSIONS
+    docx_style: str = "simple"
+    documents: list = field(default_factory=list)
+    checklist: list = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FilingManifest":
+        """
+        Read a manifest file, or the patent_build.json inside a directory.
+
+        Raises:
+            ValueError: If the manifest names an unknown format or DOCX style.
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / MANIFEST_NAME
+        directory = path.resolve().parent
+        data = json.loads(path.read_text())
+
+        docx_style = data.get("docx_style", "simple")
+        if docx_style not in RENDERERS:
+            raise ValueError(f"{path}: unknown docx_style {docx_style!r} (expected one of {sorted(RENDERERS)})")
+
+        documents = []
+        for entry in data.get("documents", []):
+            formats = tuple(entry.get("formats", ["pdf"]))
+            unknown = set(formats) - set(FORMATS)
+            if unknown:
+                raise ValueError(f"{path}: unknown format(s) {sorted(unknown)} for {entry['source']}")
+            source = directory / entry["source"]
+            documents.append(FilingDocument(source, directory / entry.get("output", source.stem), formats))
+
+        return cls(
+            directory=directory,
+            title=data.get("title", directory.name),
+            css=[directory / css for css in data.get("css", [])],
+            base_css=bool(data.get("base_css", True)),
+            markdown_extensions=tuple(data.get("markdown_extensions", DEFAULT_EXTENSIONS)),
+            docx_style=docx_style,
+            documents=documents,
+            checklist=data.get("checklist", []),
+        )
+
+
+# Per-process caches: a worker process keeps these across every target it builds.
+
+@lru_cache(maxsize=None)
+def _markdown_parser(extensions: tuple):
+    """One Python-Markdown instance per extension set, reset between documents."""
+    import markdown
+    return markdown.Markdown(extensions=list(extensions))
+
+
+@lru_cache(maxsize=None)
+def _renderer():
+    """The weasyprint session shared by every PDF rendered in this process."""
+    try:
+        from .weasy_render import WeasyRenderer
+    except ImportError:
+        from weasy_render import WeasyRenderer
+    return WeasyRenderer()
+
+
+def markdown_to_html(md_text: str, extensions: tuple = DEFAULT_EXTENSIONS) -> str:
+    """Convert markdown to a complete HTML page with a cached parser."""
+    body = _markdown_parser(tuple(extensions)).reset().convert(md_text)
+    return _HTML_PAGE.format(body=body)
+
+
+def build_pdf(
+    source: Union[str, Path],
+    output: Union[str, Path],
+    css: tuple = (),
+    extensions: tuple = DEFAULT_EXTENSIONS,
+    base_css: bool = True,
+):
+    """
+    Render a markdown file to PDF.
+
+    Relative links (figures) resolve against the markdown file's directory.
+
+    Args:
+        source: Markdown file.
+        output: PDF to write.
+        css: Stylesheet files applied after PATENT_CSS.
+        extensions: Python-Markdown extensions.
+        base_css: Whether to apply PATENT_CSS first.
+    """
+    source = Path(source)
+    renderer = _renderer()
+    stylesheets = [renderer.stylesheet(string=PATENT_CSS)] if base_css else []
+    stylesheets += [renderer.stylesheet(path) for path in css]
+    html = markdown_to_html(source.read_text(), extensions)
+    renderer.render_string(html, output, base_url=source.parent, stylesheets=stylesheets)
+
+
+def build_docx(source: Union[str, Path], output: Union[str, Path], style: str = "simple"):
+    """Convert a markdown file to DOCX with lib.md_docx."""
+    md_to_docx(source, output, style=style)
+
+
+def _missing_formats() -> dict[str, str]:
+    """Formats whose libraries are unavailable, with an install hint."""
+    missing = {}
+    try:
+        import markdown  # noqa: F401
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        missing["pdf"] = "pip install markdown weasyprint"
+    try:
+        import docx  # noqa: F401
+    except ImportError:
+        missing["docx"] = "pip install python-docx"
+    return missing
+
+
+def filing_targets(manifest: FilingManifest, missing_formats: Optional[dict] = None) -> list[BuildTarget]:
+    """
+    Build targets for every document in a filing.
+
+    Args:
+        manifest: The filing.
+        missing_formats: Formats to skip (from _missing_formats()).
+
+    Returns:
+        Targets named "<directory>/<output file>", sharing the
+        directory's build stamp.
+    """
+    missing_formats = missing_formats or {}
+    stamp = BuildStamp.for_directory(manifest.directory)
+    css = tuple(manifest.css)
+    css_salt = (PATENT_CSS if manifest.base_css else "") + "".join(
+        path.read_text() for path in css if path.exists()
+    )
+    targets = []
+
+    for document in manifest.documents:
+        if not document.source.exists():
+            print(f"⚠️  Missing source, skipped: {document.source}")
+            continue
+        inputs = markdown_inputs(document.source)
+        for fmt in document.formats:
+            output = document.output.with_name(f"{document.output.name}.{fmt}")
+            name = f"{manifest.directory.name}/{output.name}"
+            if fmt in missing_formats:
+                print(f"   Skipping {name} ({missing_formats[fmt]})")
+                continue
+            if fmt == "pdf":
+                pdf_args = (document.source, output, css, manifest.markdown_extensions, manifest.base_css)
+                func, args, salt = build_pdf, pdf_args, css_salt
+            else:
+                func, args, salt = build_docx, (document.source, output, manifest.docx_style), ""
+            targets.append(BuildTarget(name, func, args, output=output, inputs=inputs, salt=salt, stamp=stamp))
+    return targets
+
+
+def find_filings(root: Union[str, Path]) -> list[Path]:
+    """Directories under root that contain a patent_build.json."""
+    return sorted(path.parent for path in Path(root).glob(f"**/{MANIFEST_NAME}"))
+
+
+def build_filings(
+    directories: list[Union[str, Path]],
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> dict[str, float]:
+    """
+    Build every document of the given filings in one process pool.
+
+    Args:
+        directories: Filing directories (each with a patent_build.json).
+        workers: Worker processes (default: CPU count). 1 builds in this process.
+        force: Rebuild documents that are up to date.
+
+    Returns:
+        Mapping of target name to wall time, for the targets built.
+    """
+    manifests = [FilingManifest.load(directory) for directory in directories]
+    missing_formats = _missing_formats()
+
+    print(f"\n{'═' * 60}")
+    print(f"PATENT DOCUMENTS: {len(manifests)} filing(s)")
+    print(f"{'═' * 60}")
+    targets = []
+    for manifest in manifests:
+        print(f"📁 {manifest.title} ({manifest.directory})")
+        targets += filing_targets(manifest, missing_formats)
+    print()
+
+    timings = build_targets(targets, workers=workers, force=force)
+
+    for manifest in manifests:
+        if manifest.checklist:
+            print(f"\n{manifest.title} — ready to file:")
+            for line in manifest.checklist:
+                print(f"  - {line}")
+    print(f"\nUpload to USPTO Patent Center: {PATENT_CENTER_URL}")
+    return timings
+
+
+def main(argv: Optional[list[str]] = None):
+    """CLI entry point."""
+    shared_dir = Path(__file__).resolve().parent.parent
+
+    parser = argparse.ArgumentParser(description="Build patent filing PDFs/DOCX from patent_build.json manifests")
+    parser.add_argument("directories", nargs="*", type=Path,
+                        help=f"Filing directories (default: every {MANIFEST_NAME} under {shared_dir})")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild documents that are up to date")
+    args = parser.parse_args(argv)
+
+    directories = []
+    for directory in args.directories or find_filings(shared_dir):
+        if (directory / MANIFEST_NAME).exists():
+            directories.append(directory)
+        else:
+            print(f"⚠️  No {MANIFEST_NAME} in {directory}, skipped")
+    if not directories:
+        print("❌ No patent filings to build.")
+        sys.exit(1)
+
+    build_filings(directories, workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting and Retry for Gemini Calls
+========================================
+A shared token-bucket rate limiter plus jittered exponential backoff that
+honours Retry-After, so batches run at the highest request rate the quota
+sustains instead of aborting on the first 429.
+
+The limiter is adaptive (AIMD): every 429 halves the allowed request rate,
+every success creeps it back up towards the configured maximum.
+
+Usage:
+    from lib.rate_limit import call_with_retry, get_rate_limiter
+
+    response = call_with_retry(
+        client.models.generate_content,
+        model="gemini-3-pro-image-preview",
+        contents=[prompt],
+        config=config,
+    )
+
+    # Async
+    response = await acall_with_retry(client.aio.models.generate_content, ...)
+
+Environment:
+    GEMINI_RPM: Maximum requests per minute for the shared limiter (default 60).
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import re
+import threading
+import time
+from datetime import timezone
+from typing import Callable, Optional
+
+
+# HTTP statuses worth retrying: quota, timeouts and transient server errors
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with additive-increase/multiplicative-decrease.
+
+    Attributes:
+        max_rate: Upper bound on tokens per second.
+        rate: Current tokens per second (lowered on 429s, raised on success).
+        capacity: Maximum burst size.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Maximum sustained requests per second.
+            capacity: Burst size (tokens the bucket can hold).
+            min_rate: Floor for the adaptive rate. Defaults to rate / 32.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 32
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate:.3f}/s, max={self.max_rate:.3f}/s, capacity={self.capacity})"
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait first. Lock held."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        return max(wait, self._blocked_until - now)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self._lock:
+            wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Async version of acquire(); never blocks the event loop."""
+        with self._lock:
+            wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Halve the rate after a 429; optionally pause everyone for retry_after seconds."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def reward(self):
+        """Grow the rate back towards max_rate after a successful call."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 16)
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff ("full jitter").
+
+    Attributes:
+        max_attempts: Total tries including the first one.
+        base_delay: Backoff for the first retry, in seconds.
+        max_delay: Cap on any single wait, in seconds.
+    """
+
+    def __init__(self, max_attempts: int = 6, base_delay: float = 2.0, max_delay: float = 90.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based)."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            return min(self.max_delay, max(retry_after, backoff))
+        return backoff
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by an SDK/HTTP exception, if any."""
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Server-suggested wait from a Retry-After header or a Gemini RetryInfo detail.
+
+    Returns:
+        Seconds to wait, or None if the error carries no hint.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # HTTP-date form; Python >= 3.10 raises instead of returning None
+            try:
+                parsed = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if parsed is None:
+                return None
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return max(0.0, parsed.timestamp() - time.time())
+
+    # google.rpc.RetryInfo, e.g. {"@type": ".../google.rpc.RetryInfo", "retryDelay": "37s"}
+    details = getattr(exc, "details", None)
+    match = re.search(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", str(details or exc))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an exception is a transient failure worth retrying."""
+    status = error_status(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # Network-level failures (httpx/requests errors subclass these or are named so)
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    return type(exc).__name__ in {"ConnectError", "ReadTimeout", "ConnectTimeout", "RemoteProtocolError", "ReadError"}
+
+
+_default_limiter: Optional[TokenBucket] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """
+    Return the process-wide limiter shared by every Gemini caller.
+
+    Its maximum rate comes from the GEMINI_RPM environment variable
+    (requests per minute, default 60).
+    """
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            rpm = float(os.getenv("GEMINI_RPM", "60"))
+            _default_limiter = TokenBucket(rate=rpm / 60.0, capacity=max(1.0, rpm / 60.0))
+    return _default_limiter
+
+
+def _log_retry(exc: BaseException, attempt: int, wait: float, log: Optional[Callable[[str], None]]):
+    status = error_status(exc)
+    label = f"HTTP {status}" if status else type(exc).__name__
+    (log or print)(f"   ⏳ {label}, retry {attempt} in {wait:.1f}s")
+
+
+def call_with_retry(
+    fn: Callable,
+    *args,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    log: Optional[Callable[[str], None]] = None,
+    **kwargs,
+):
+    """
+    Call ``fn(*args, **kwargs)`` under the rate limiter, retrying transient errors.
+
+    Args:
+        fn: The API call (e.g. ``client.models.generate_content``).
+        limiter: Token bucket to draw from. Defaults to get_rate_limiter().
+        policy: Backoff policy. Defaults to RetryPolicy().
+        log: Callable used for retry messages (defaults to print).
+
+    Returns:
+        Whatever fn returns.
+
+    Raises:
+        The last exception once retries are exhausted, or any non-retryable error.
+    """
+    limiter = limiter or get_rate_limiter()
+    policy = policy or RetryPolicy()
+
+    for attempt in range(1, policy.max_attempts + 1):
+        limiter.acquire()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == policy.max_attempts or not is_retryable(e):
+                raise
+            retry_after = retry_after_seconds(e)
+            if error_status(e) == 429:
+                limiter.penalize(retry_after)
+            wait = policy.delay(attempt, retry_after)
+            _log_retry(e, attempt, wait, log)
+            time.sleep(wait)
+        else:
+            limiter.reward()
+            return result
+
+
+async def acall_with_retry(
+    fn: Callable,
+    *args,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    log: Optional[Callable[[str], None]] = None,
+    **kwargs,
+):
+    """Async version of call_with_retry() for coroutine functions such as ``client.aio``."""
+    limiter = limiter or get_rate_limiter()
+    policy = policy or RetryPolicy()
+
+    for attempt in range(1, policy.max_attempts + 1):
+        await limiter.aacquire()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == policy.max_attempts or not is_retryable(e):
+                raise
+            retry_after = retry_after_seconds(e)
+            if error_status(e) == 429:
+                limiter.penalize(retry_after)
+            wait = policy.delay(attempt, retry_after)
+            _log_retry(e, attempt, wait, log)
+            await asyncio.sleep(wait)
+        else:
+            limiter.reward()
+            return result
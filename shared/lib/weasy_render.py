@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+WeasyPrint Batch Renderer
+=========================
+Render many HTML documents to PDF in one process, reusing everything
+weasyprint would otherwise rebuild per document:
+
+- one FontConfiguration, so @font-face rules and system fonts are
+  resolved once;
+- parsed stylesheets, cached by their text (or path and mtime);
+- fetched resources (logos, fonts, linked CSS), cached by URL;
+- decoded images, via weasyprint's own image cache.
+
+Usage:
+    from lib.weasy_render import WeasyRenderer
+
+    renderer = WeasyRenderer()
+    extra = renderer.stylesheet(string="@page { size: letter; margin: 1in; }")
+    for html_path in Path("templates").glob("*.html"):
+        renderer.render(html_path, f"out/{html_path.stem}.pdf", stylesheets=[extra])
+
+    # Filled-in template text rendered against the template's directory
+    renderer.render_string(html, "out/quote_001.pdf", base_url=Path("templates"))
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+
+def _load_weasyprint():
+    try:
+        import weasyprint
+    except ImportError:
+        print("❌ weasyprint not installed.")
+        print("   Install with: pip install weasyprint")
+        sys.exit(1)
+    return weasyprint
+
+
+def _caching_url_fetcher(weasyprint):
+    """
+    A url_fetcher that downloads/reads each URL once per renderer.
+
+    Recent weasyprint takes a URLFetcher instance; older versions take a
+    function returning a dict.
+    """
+    from weasyprint import urls
+
+    if hasattr(urls, "URLFetcher"):
+        class CachingURLFetcher(urls.URLFetcher):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._cache = {}
+
+            def fetch(self, url, headers=None):
+                hit = self._cache.get(url)
+                if hit is None:
+                    response = super().fetch(url, headers)
+                    try:
+                        body = response.read()
+                    finally:
+                        response.close()
+                    hit = self._cache[url] = (response.geturl(), body, response.headers, response.status)
+                final_url, body, response_headers, status = hit
+                return urls.URLFetcherResponse(final_url, body=body, headers=response_headers, status=status)
+
+        return CachingURLFetcher()
+
+    cache = {}
+
+    def fetch(url):
+        hit = cache.get(url)
+        if hit is None:
+            result = weasyprint.default_url_fetcher(url)
+            file_obj = result.pop("file_obj", None)
+            if file_obj is not None:
+                try:
+                    result["string"] = file_obj.read()
+                finally:
+                    file_obj.close()
+            hit = cache[url] = result
+        return dict(hit)
+
+    return fetch
+
+
+class WeasyRenderer:
+    """
+    A weasyprint session whose fonts, stylesheets and resources are
+    shared by every document it renders.
+
+    Not thread-safe; use one renderer per process (or per worker).
+
+    Attributes:
+        font_config: Shared FontConfiguration.
+        url_fetcher: Caching fetcher handed to every HTML/CSS object.
+        rendered: Number of documents rendered so far.
+    """
+
+    def __init__(self, verbose: bool = False):
+        """
+        Load weasyprint and set up the shared caches.
+
+        Args:
+            verbose: Whether to print one line per rendered document.
+        """
+        self._weasyprint = _load_weasyprint()
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.verbose = verbose
+        self.font_config = FontConfiguration()
+        self.url_fetcher = _caching_url_fetcher(self._weasyprint)
+        self.rendered = 0
+        self._stylesheets: dict[tuple, object] = {}
+        self._image_cache: dict = {}
+        major = int(self._weasyprint.__version__.split(".")[0])
+        self._cache_option = "cache" if major >= 59 else "image_cache"
+
+    def stylesheet(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        string: Optional[str] = None,
+    ):
+        """
+        Parsed CSS for a file or a string, parsed only the first time.
+
+        A file is re-parsed when its modification time changes.
+
+        Args:
+            path: Stylesheet file.
+            string: Stylesheet text (used when path is None).
+        """
+        if path is not None:
+            path = Path(path).resolve()
+            key = ("path", str(path), path.stat().st_mtime_ns)
+        elif string is not None:
+            key = ("string", string)
+        else:
+            raise ValueError("stylesheet() needs a path or a string")
+
+        css = self._stylesheets.get(key)
+        if css is None:
+            css = self._weasyprint.CSS(
+                filename=str(path) if path is not None else None,
+                string=string if path is None else None,
+                font_config=self.font_config,
+                url_fetcher=self.url_fetcher,
+            )
+            self._stylesheets[key] = css
+        return css
+
+    def _write(self, html, output_path: Union[str, Path], stylesheets: Optional[list]) -> float:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.time()
+        html.write_pdf(
+            output_path,
+            stylesheets=stylesheets,
+            font_config=self.font_config,
+            **{self._cache_option: self._image_cache},
+        )
+        elapsed = time.time() - start
+        self.rendered += 1
+        if self.verbose:
+            print(f"✅ PDF created: {output_path} ({elapsed:.2f}s)")
+        return elapsed
+
+    def render(
+        self,
+        html_path: Union[str, Path],
+        output_path: Union[str, Path],
+        stylesheets: Optional[list] = None,
+    ) -> float:
+        """
+        Render an HTML file. Relative URLs resolve against its directory.
+
+        Args:
+            html_path: HTML file.
+            output_path: PDF to write.
+            stylesheets: Extra CSS objects from stylesheet().
+
+        Returns:
+            Render time in seconds.
+        """
+        html_path = Path(html_path)
+        html = self._weasyprint.HTML(
+            filename=str(html_path),
+            base_url=html_path.parent.absolute().as_uri(),
+            url_fetcher=self.url_fetcher,
+        )
+        return self._write(html, output_path, stylesheets)
+
+    def render_string(
+        self,
+        html: str,
+        output_path: Union[str, Path],
+        base_url: Optional[Union[str, Path]] = None,
+        stylesheets: Optional[list] = None,
+    ) -> float:
+        """
+        Render HTML text (e.g. a filled-in template).
+
+        Args:
+            html: Document markup.
+            output_path: PDF to write.
+            base_url: Path or URL relative links resolve against (render()
+                      uses the HTML file's directory).
+            stylesheets: Extra CSS objects from stylesheet().
+
+        Returns:
+            Render time in seconds.
+        """
+        if isinstance(base_url, Path) or (base_url and "://" not in base_url):
+            base_url = Path(base_url).absolute().as_uri()
+        document = self._weasyprint.HTML(string=html, base_url=base_url, url_fetcher=self.url_fetcher)
+        return self._write(document, output_path, stylesheets)